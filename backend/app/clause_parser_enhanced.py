@@ -5,7 +5,11 @@ LLM-powered intelligent parsing of ESG standards with fallback to regex
 
 import re
 import time
+import random
 import gc
+import hashlib
+import threading
+from collections import OrderedDict
 import fitz  # PyMuPDF
 from typing import List, Dict, Optional, Tuple, Any
 import logging
@@ -27,10 +31,17 @@ logger = logging.getLogger(__name__)
 class EnhancedClauseParser:
     """Enhanced parser with LLM-based intelligent extraction"""
     
+    # Bump when parsing logic/prompts change output (invalidates on-disk parse caches)
+    PARSER_VERSION = 1
+    
     def __init__(self, use_llm: bool = True):
         self.standards_dir = Path(settings.standards_dir)
         self.use_llm = use_llm
         self.llm_client = None
+        # LRU of raw LLM parse responses keyed by framework + normalized chunk text
+        self._llm_parse_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._llm_parse_cache_size = settings.parse_llm_cache_size
+        self._llm_parse_cache_lock = threading.Lock()  # re-parses may run on executor threads
         
         if use_llm:
             try:
@@ -120,6 +131,23 @@ class EnhancedClauseParser:
     def parse_framework(self, framework: ESGFramework) -> List[ESGClause]:
         """Parse only one framework (e.g. for incremental add when others already in DB)."""
         all_clauses = []
+        pdf_files = self.list_framework_pdfs(framework)
+        for pdf_path in pdf_files:
+            try:
+                clauses = self._parse_standard_document(pdf_path, framework)
+                all_clauses.extend(clauses)
+                logger.info(f"Parsed {len(clauses)} clauses from {pdf_path.name}")
+                # Clear clauses list after extending to free memory
+                del clauses
+                gc.collect()
+            except Exception as e:
+                logger.error(f"Error parsing {pdf_path.name}: {e}")
+        logger.info(f"Total parsed for {framework.value}: {len(all_clauses)} clauses")
+        del pdf_files  # Clear PDF list
+        return all_clauses
+    
+    def list_framework_pdfs(self, framework: ESGFramework) -> List[Path]:
+        """Sorted standard PDFs parse_framework would parse for a framework (after GRI/SASB filtering)"""
         framework_dir = self.standards_dir / framework.value
         if not framework_dir.exists():
             logger.warning(f"{framework.value} directory not found: {framework_dir}")
@@ -141,19 +169,11 @@ class EnhancedClauseParser:
             logger.info(f"Filtered SASB to {len(pdf_files)} essential standards (from {original_count} total)")
         
         logger.info(f"Found {len(pdf_files)} PDF files for {framework.value}")
-        for pdf_path in pdf_files:
-            try:
-                clauses = self._parse_standard_document(pdf_path, framework)
-                all_clauses.extend(clauses)
-                logger.info(f"Parsed {len(clauses)} clauses from {pdf_path.name}")
-                # Clear clauses list after extending to free memory
-                del clauses
-                gc.collect()
-            except Exception as e:
-                logger.error(f"Error parsing {pdf_path.name}: {e}")
-        logger.info(f"Total parsed for {framework.value}: {len(all_clauses)} clauses")
-        del pdf_files  # Clear PDF list
-        return all_clauses
+        return pdf_files
+    
+    def parse_mode(self) -> str:
+        """Parsing mode ("llm:<model>" or "regex"); part of on-disk parse cache keys"""
+        return f"llm:{self.llm_model}" if self.use_llm else "regex"
     
     def _parse_standard_document(
         self, 
@@ -163,29 +183,44 @@ class EnhancedClauseParser:
         """
         Parse a single standard document using LLM or regex fallback
         """
+        return self._parse_standard_document_with_mode(pdf_path, framework)[0]
+    
+    def _parse_standard_document_with_mode(
+        self, 
+        pdf_path: Path, 
+        framework: ESGFramework
+    ) -> Tuple[List[ESGClause], Optional[str]]:
+        """
+        Parse a single standard document; also returns the mode of a complete result
+        
+        The mode is parse_mode() when the document was fully parsed in this
+        parser's mode, and None for degraded output that must not be cached:
+        no extractable text, skipped LLM chunks, regex fallback or no clauses.
+        """
         # Extract text from PDF
         text, page_count = self._extract_pdf_text(pdf_path)
         
         if not text or len(text.strip()) < 100:
             logger.warning(f"Insufficient text in {pdf_path.name}")
-            return []
+            return [], None
         
         # Try LLM-based parsing first (more accurate)
         if self.use_llm and self.llm_client:
             try:
-                clauses = self._llm_parse_document(
+                clauses, failed_chunks = self._llm_parse_document(
                     text=text,
                     pdf_path=pdf_path,
                     framework=framework
                 )
                 if clauses:
-                    return clauses
+                    return clauses, None if failed_chunks else self.parse_mode()
                 logger.info(f"LLM parsing returned no clauses for {pdf_path.name}, trying regex...")
             except Exception as e:
                 logger.warning(f"LLM parsing failed for {pdf_path.name}: {e}, falling back to regex")
+            return self._regex_parse_document(text, pdf_path, framework), None
         
-        # Fallback to regex-based parsing
-        return self._regex_parse_document(text, pdf_path, framework)
+        clauses = self._regex_parse_document(text, pdf_path, framework)
+        return clauses, self.parse_mode() if clauses else None
     
     def _extract_pdf_text(self, pdf_path: Path) -> Tuple[str, int]:
         """Extract clean text from PDF (memory-efficient: process page-by-page)"""
@@ -270,10 +305,11 @@ class EnhancedClauseParser:
         text: str,
         pdf_path: Path,
         framework: ESGFramework
-    ) -> List[ESGClause]:
+    ) -> Tuple[List[ESGClause], int]:
         """
         Use LLM to intelligently extract clauses from the standard document.
         Memory-optimized: process chunks one at a time and clear intermediate data.
+        Returns the clauses and the number of chunks that failed and were skipped.
         """
         max_chars_per_call = 45000  # Reduced from 60k to 45k for memory safety
         chunks = self._split_text_into_chunks(
@@ -292,33 +328,29 @@ class EnhancedClauseParser:
         
         all_clauses = []
         seen_ids = set()
+        failed_chunks = 0
         
         for i, chunk in enumerate(chunks):
             chunk_text = chunk[:max_chars_per_call] if len(chunk) > max_chars_per_call else chunk
             del chunk  # Clear chunk immediately after extracting text
+            cache_key = self._llm_parse_cache_key(chunk_text, framework)
+            content = self._lookup_llm_parse_cache(cache_key)
+            cached = content is not None
+            if cached:
+                logger.info(f"Chunk {i + 1}/{len(chunks)}: reusing cached LLM response")
             prompt = self._build_parsing_prompt(chunk_text, pdf_path, framework)
             del chunk_text  # Clear chunk text after building prompt
             
             try:
-                response = self.llm_client.chat.completions.create(
-                    model=self.llm_model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": f"You are an expert at extracting structured compliance requirements from {framework.value} ESG standard documents."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=1,  # gpt-5-nano only supports default (1)
-                    response_format={"type": "json_object"}
-                )
+                if not cached:
+                    content = self._call_parsing_llm(prompt, framework)
                 del prompt  # Clear prompt after API call
                 
-                result = json.loads(response.choices[0].message.content)
-                del response  # Clear response immediately
+                result = json.loads(content)
+                if not cached:
+                    # Only responses that parse are cached; bad JSON is retried next time
+                    self._store_llm_parse_cache(cache_key, content)
+                del content
                 
                 clauses = self._convert_llm_response_to_clauses(result, pdf_path, framework)
                 del result  # Clear result after conversion
@@ -336,21 +368,100 @@ class EnhancedClauseParser:
                 if len(chunks) > 1:
                     logger.info(f"Chunk {i + 1}/{len(chunks)}: extracted {len([k for k in seen_ids])} unique clauses so far")
                 
-                # Delay and garbage collection between chunks
-                if i < len(chunks) - 1:
+                # Delay and garbage collection between chunks (no delay needed after a cache hit)
+                if i < len(chunks) - 1 and not cached:
                     time.sleep(0.5)  # Reduced delay for faster parsing with gpt-4o-mini
                     gc.collect()
                     logger.info(f"Memory cleared, waiting before next chunk...")
                     
             except Exception as e:
                 logger.warning(f"LLM parsing failed for chunk {i + 1}: {e}")
+                failed_chunks += 1
         
         del chunks  # Clear chunks list
         del seen_ids  # Clear seen_ids set
         gc.collect()
         
         logger.info(f"LLM extracted {len(all_clauses)} clauses from {pdf_path.name}")
-        return all_clauses
+        return all_clauses, failed_chunks
+    
+    def _call_parsing_llm(
+        self,
+        prompt: str,
+        framework: ESGFramework,
+        max_retries: int = 5
+    ) -> str:
+        """
+        Send one parsing prompt to the LLM and return the raw JSON response text
+        
+        Transient failures (rate limits, timeouts, dropped connections, 5xx)
+        are retried with exponential backoff so one blip doesn't lose the
+        chunk; anything else is raised immediately.
+        """
+        retryable = (
+            openai.RateLimitError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        )
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.llm_client.chat.completions.create(
+                    model=self.llm_model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": f"You are an expert at extracting structured compliance requirements from {framework.value} ESG standard documents."
+                        },
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ],
+                    temperature=1,  # gpt-5-nano only supports default (1)
+                    response_format={"type": "json_object"}
+                )
+                return response.choices[0].message.content
+            except retryable as e:
+                if attempt == max_retries:
+                    logger.error(f"LLM parsing request still failing after {max_retries} retries: {e}")
+                    raise
+                delay = min(2 ** (attempt + 1), 60) + random.random()
+                logger.warning(f"LLM parsing request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    def _llm_parse_cache_key(self, chunk_text: str, framework: ESGFramework) -> str:
+        """
+        Hash model, framework and whitespace-normalized chunk text into a cache key
+        
+        The document filename is left out so boilerplate shared across PDFs
+        (repeated recommendation text, section headings) hits the same entry.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.llm_model.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(framework.value.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(" ".join(chunk_text.split()).encode("utf-8"))
+        return h.hexdigest()
+    
+    def _lookup_llm_parse_cache(self, key: str) -> Optional[str]:
+        """Cached raw LLM response for a chunk (marked most recently used), or None"""
+        with self._llm_parse_cache_lock:
+            content = self._llm_parse_cache.get(key)
+            if content is not None:
+                self._llm_parse_cache.move_to_end(key)
+            return content
+    
+    def _store_llm_parse_cache(self, key: str, content: str):
+        """Insert into the parse response cache, evicting least recently used entries"""
+        if self._llm_parse_cache_size <= 0:
+            return
+        with self._llm_parse_cache_lock:
+            self._llm_parse_cache[key] = content
+            self._llm_parse_cache.move_to_end(key)
+            while len(self._llm_parse_cache) > self._llm_parse_cache_size:
+                self._llm_parse_cache.popitem(last=False)
     
     def _build_parsing_prompt(
         self, 
@@ -5,8 +5,11 @@ Main compliance evaluation engine combining semantic retrieval, LLM, and rule va
 
 import openai
 from typing import List, Optional, Dict, Any
+from collections import OrderedDict
+import hashlib
 import logging
 import json
+import threading
 from datetime import datetime
 
 from app.models import (
@@ -29,11 +32,18 @@ logger = logging.getLogger(__name__)
 class CompliancePipeline:
     """Orchestrate the complete compliance evaluation pipeline"""
     
+    # Clause queries per embedding request when prefetching evidence
+    SEARCH_BATCH_SIZE = 50
+    
     def __init__(self):
         self.vector_store = VectorStore()
         self.rule_validator = RuleValidator()
         self.llm_client = openai.OpenAI(api_key=settings.openai_api_key)
         self.llm_model = settings.llm_model
+        # LRU cache of LLM evaluations keyed by clause + evidence hash
+        self._llm_cache: "OrderedDict[str, LLMEvaluation]" = OrderedDict()
+        self._llm_cache_size = settings.llm_cache_size
+        self._llm_cache_lock = threading.Lock()  # evaluations may run on worker threads
     
     def evaluate_document(
         self,
@@ -58,9 +68,14 @@ class CompliancePipeline:
         
         evaluations = []
         
-        for clause in clauses:
+        # Retrieve evidence for every clause up front (batched embeddings and queries)
+        prefetched = self._prefetch_evidence(document_id, clauses)
+        
+        for clause, retrieved_evidence in zip(clauses, prefetched):
             try:
-                evaluation = self.evaluate_clause(document_id, clause)
+                evaluation = self.evaluate_clause(
+                    document_id, clause, retrieved_evidence=retrieved_evidence
+                )
                 evaluations.append(evaluation)
             except Exception as e:
                 logger.error(f"Error evaluating clause {clause.clause_id}: {e}")
@@ -88,7 +103,8 @@ class CompliancePipeline:
         self,
         document_id: str,
         clause: ESGClause,
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        retrieved_evidence: Optional[List[RetrievedEvidence]] = None
     ) -> ClauseEvaluation:
         """
         Evaluate a single clause against a document
@@ -103,6 +119,7 @@ class CompliancePipeline:
             document_id: Document to evaluate
             clause: ESG clause to check
             top_k: Number of chunks to retrieve
+            retrieved_evidence: Evidence already retrieved for this clause (skips step 1)
         
         Returns:
             Clause evaluation result
@@ -112,12 +129,13 @@ class CompliancePipeline:
         logger.debug(f"Evaluating clause {clause.clause_id}")
         
         # Step 1: Semantic Retrieval
-        query = self._construct_search_query(clause)
-        retrieved_evidence = self.vector_store.search_documents(
-            query=query,
-            document_id=document_id,
-            top_k=top_k
-        )
+        if retrieved_evidence is None:
+            query = self._construct_search_query(clause)
+            retrieved_evidence = self.vector_store.search_documents(
+                query=query,
+                document_id=document_id,
+                top_k=top_k
+            )
         
         if not retrieved_evidence:
             logger.warning(f"No evidence found for clause {clause.clause_id}")
@@ -159,6 +177,31 @@ class CompliancePipeline:
         
         return evaluation
     
+    def _prefetch_evidence(
+        self,
+        document_id: str,
+        clauses: List[ESGClause]
+    ) -> List[Optional[List[RetrievedEvidence]]]:
+        """
+        Retrieve evidence for many clauses with batched embedding/search calls
+        
+        A failed batch yields None for its clauses, so they fall back to
+        per-clause retrieval (and per-clause error handling) in evaluate_clause.
+        """
+        prefetched: List[Optional[List[RetrievedEvidence]]] = []
+        batch_size = self.SEARCH_BATCH_SIZE
+        for i in range(0, len(clauses), batch_size):
+            batch = clauses[i:i+batch_size]
+            try:
+                prefetched.extend(self.vector_store.search_documents_batch(
+                    [self._construct_search_query(c) for c in batch],
+                    document_ids=[document_id] * len(batch)
+                ))
+            except Exception as e:
+                logger.warning(f"Batched evidence retrieval failed, retrying per clause: {e}")
+                prefetched.extend([None] * len(batch))
+        return prefetched
+    
     def _construct_search_query(self, clause: ESGClause) -> str:
         """Construct semantic search query from clause"""
         # Combine title, description, and keywords
@@ -189,6 +232,15 @@ class CompliancePipeline:
         Returns:
             LLM evaluation result with reasoning traces
         """
+        cache_key = self._llm_cache_key(clause, evidence)
+        with self._llm_cache_lock:
+            cached = self._llm_cache.get(cache_key)
+            if cached is not None:
+                self._llm_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit for {clause.clause_id}")
+            return cached
+        
         try:
             # Step 1: Chain-of-Thought Reasoning
             cot_result = self._chain_of_thought_reasoning(clause, evidence)
@@ -225,7 +277,7 @@ class CompliancePipeline:
                 ComplianceStatus.NOT_SUPPORTED
             )
             
-            return LLMEvaluation(
+            llm_evaluation = LLMEvaluation(
                 status=status,
                 confidence=float(final_result.get("confidence", 0.5)),
                 explanation=final_result.get("explanation", ""),
@@ -236,6 +288,10 @@ class CompliancePipeline:
                 revised=revised
             )
             
+            # Only successful evaluations are cached; failures are retried next run
+            self._store_llm_cache(cache_key, llm_evaluation)
+            return llm_evaluation
+            
         except Exception as e:
             logger.error(f"Agentic LLM evaluation error: {e}")
             return LLMEvaluation(
@@ -245,6 +301,64 @@ class CompliancePipeline:
                 reasoning=""
             )
     
+    @staticmethod
+    def _format_evidence(evidence: List[RetrievedEvidence]) -> str:
+        """Evidence block shared by the LLM prompts (top 5 for token efficiency)"""
+        return "\n\n".join([
+            f"[Evidence {i+1}] (Page {ev.page_number}, Similarity: {ev.similarity_score:.2f})\n{ev.text}"
+            for i, ev in enumerate(evidence[:5])
+        ])
+    
+    def _llm_cache_key(
+        self,
+        clause: ESGClause,
+        evidence: List[RetrievedEvidence]
+    ) -> str:
+        """
+        Hash every input the evaluation prompts use into a cache key
+        
+        Covers the clause fields rendered into the prompts and the evidence
+        block exactly as sent (top 5, in order, with pages and scores), so
+        two evaluations share a verdict only if their prompts match.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for part in (
+            self.llm_model,
+            clause.framework.value,
+            clause.clause_id,
+            clause.section or "",
+            clause.title,
+            clause.description,
+            ",".join(et.value for et in clause.required_evidence_type),
+            str(clause.mandatory),
+            self._format_evidence(evidence),
+        ):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+    
+    def _store_llm_cache(self, key: str, llm_evaluation: LLMEvaluation):
+        """Insert into the LLM cache, evicting least recently used entries"""
+        if self._llm_cache_size <= 0:
+            return
+        with self._llm_cache_lock:
+            self._llm_cache[key] = llm_evaluation
+            self._llm_cache.move_to_end(key)
+            while len(self._llm_cache) > self._llm_cache_size:
+                self._llm_cache.popitem(last=False)
+    
+    def clear_llm_cache(self) -> int:
+        """
+        Drop all cached LLM evaluations
+        
+        Returns:
+            Number of entries cleared
+        """
+        with self._llm_cache_lock:
+            cleared = len(self._llm_cache)
+            self._llm_cache.clear()
+        return cleared
+    
     def _chain_of_thought_reasoning(
         self,
         clause: ESGClause,
@@ -254,10 +368,7 @@ class CompliancePipeline:
         Step 1: Chain-of-Thought reasoning
         LLM thinks through the problem step-by-step
         """
-        evidence_text = "\n\n".join([
-            f"[Evidence {i+1}] (Page {ev.page_number}, Similarity: {ev.similarity_score:.2f})\n{ev.text}"
-            for i, ev in enumerate(evidence[:5])
-        ])
+        evidence_text = self._format_evidence(evidence)
         
         prompt = f"""You are an expert ESG compliance analyst. Analyze this ESG clause against the provided evidence using step-by-step reasoning.
 
@@ -392,10 +503,7 @@ Be thorough and critical. Identify any weaknesses in the reasoning."""
         Step 3: Revision (if needed)
         LLM revises its analysis based on identified issues
         """
-        evidence_text = "\n\n".join([
-            f"[Evidence {i+1}] (Page {ev.page_number}, Similarity: {ev.similarity_score:.2f})\n{ev.text}"
-            for i, ev in enumerate(evidence[:5])
-        ])
+        evidence_text = self._format_evidence(evidence)
         
         prompt = f"""You previously analyzed an ESG clause, and a critical review identified some issues. Please revise your analysis.
 
@@ -456,10 +564,7 @@ Address the identified issues and provide a more accurate analysis."""
     ) -> str:
         """Build prompt for LLM evaluation"""
         
-        evidence_text = "\n\n".join([
-            f"[Evidence {i+1}] (Page {ev.page_number}, Similarity: {ev.similarity_score:.2f})\n{ev.text}"
-            for i, ev in enumerate(evidence[:5])  # Limit to top 5 for token efficiency
-        ])
+        evidence_text = self._format_evidence(evidence)
         
         prompt = f"""
 Evaluate whether the following evidence supports compliance with the ESG clause requirement.
@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     # LLM Configuration
     llm_model: str = "gpt-4o-mini"  # Faster and more accurate than gpt-5-nano
     embedding_model: str = "text-embedding-3-small"
+    embedding_concurrency: int = 4  # Embedding requests in flight when indexing (1 = sequential)
     use_llm_parsing: bool = True  # Enabled for SASB parsing
     
     # Vector Database
@@ -25,6 +26,11 @@ class Settings(BaseSettings):
     # Application
     environment: str = "development"
     log_level: str = "INFO"
+    # Uvicorn workers for `python -m app.main`. Keep at 1 while documents/reports
+    # are held in process memory; each worker would get its own copy.
+    workers: int = 1
+    # Threads for blocking work (PDF processing, embeddings, LLM evaluation, parsing)
+    worker_threads: int = 4
     # Comma-separated frameworks to parse on startup (e.g. "BRSR,GRI,TCFD")
     parse_frameworks: str = "BRSR,GRI,TCFD,SASB"  # All frameworks enabled
     # Frameworks to always re-parse on startup (never load from DB). e.g. "GRI"
@@ -38,6 +44,11 @@ class Settings(BaseSettings):
     top_k_chunks: int = 5
     confidence_threshold: float = 0.7
     
+    # Caching
+    llm_cache_size: int = 1024  # Max cached LLM clause evaluations (0 disables)
+    query_embedding_cache_size: int = 4096  # Max cached search query embeddings (0 disables)
+    parse_llm_cache_size: int = 512  # Max cached LLM parse responses per parser (0 disables)
+    
     # Storage Paths
     upload_dir: str = "./data/uploads"
     clause_db_path: str = "./data/clauses.db"
@@ -4,12 +4,15 @@ Handles PDF parsing, chunking, and embedding generation
 """
 
 import fitz  # PyMuPDF
+import asyncio
 import hashlib
+import random
 import tiktoken
 from typing import List, Tuple, Optional
 from pathlib import Path
 import logging
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from app.models import DocumentChunk, DocumentMetadata
 from app.config import settings
@@ -191,8 +194,17 @@ class DocumentProcessor:
         
         return None
     
-    def generate_document_id(self, filepath: str) -> str:
-        """Generate unique document ID from filepath"""
+    def generate_document_id(self, filepath: str, content_digest: Optional[str] = None) -> str:
+        """
+        Generate unique document ID
+        
+        Args:
+            filepath: Path of the stored document
+            content_digest: Hex digest of the file contents computed while writing it;
+                used as the ID when given, so identical uploads share an ID
+        """
+        if content_digest:
+            return content_digest[:16]
         return hashlib.md5(filepath.encode()).hexdigest()[:16]
 
 
@@ -227,11 +239,7 @@ class EmbeddingGenerator:
         """Generate embeddings for multiple texts. Each text must be non-empty and valid."""
         if not texts:
             return []
-        # Ensure every item is a non-empty string (API rejects empty/invalid input)
-        cleaned = []
-        for t in texts:
-            s = (t or "").strip() if isinstance(t, str) else str(t or "").strip()
-            cleaned.append(s if s else "(no text)")
+        cleaned = self._clean_texts(texts)
         try:
             response = self.client.embeddings.create(
                 model=self.model,
@@ -241,3 +249,84 @@ class EmbeddingGenerator:
         except Exception as e:
             logger.error(f"Error generating batch embeddings: {e}")
             raise
+    
+    def generate_embeddings_batches(
+        self,
+        batches: List[List[str]],
+        concurrency: Optional[int] = None
+    ) -> List[List[List[float]]]:
+        """
+        Generate embeddings for several batches with up to `concurrency` requests in flight
+        
+        Overlaps the network latency of consecutive batches. Safe to call from
+        inside a running event loop (the requests then run on a helper thread).
+        
+        Returns:
+            One list of embeddings per batch, in batch order
+        """
+        concurrency = concurrency or settings.embedding_concurrency
+        if len(batches) <= 1 or concurrency <= 1:
+            return [self.generate_embeddings_batch(texts) for texts in batches]
+        
+        coro = self._generate_embeddings_batches_async(batches, concurrency)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, coro).result()
+    
+    async def _generate_embeddings_batches_async(
+        self,
+        batches: List[List[str]],
+        concurrency: int
+    ) -> List[List[List[float]]]:
+        """Gather the batches on one async client, bounded by a semaphore"""
+        from openai import AsyncOpenAI
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        # Client per run: its connection pool is bound to this event loop
+        async with AsyncOpenAI(api_key=settings.openai_api_key) as client:
+            async def run(texts: List[str]) -> List[List[float]]:
+                async with semaphore:
+                    return await self.generate_embeddings_batch_async(texts, client)
+            
+            return await asyncio.gather(*(run(texts) for texts in batches))
+    
+    async def generate_embeddings_batch_async(
+        self,
+        texts: List[str],
+        client,
+        max_retries: int = 5
+    ) -> List[List[float]]:
+        """Async generate_embeddings_batch; retries rate-limited (429) requests with exponential backoff"""
+        from openai import RateLimitError
+        if not texts:
+            return []
+        cleaned = self._clean_texts(texts)
+        for attempt in range(max_retries + 1):
+            try:
+                response = await client.embeddings.create(
+                    model=self.model,
+                    input=cleaned
+                )
+                return [data.embedding for data in response.data]
+            except RateLimitError as e:
+                if attempt == max_retries:
+                    logger.error(f"Embedding rate limit persisted after {max_retries} retries: {e}")
+                    raise
+                delay = 2 ** attempt + random.random()
+                logger.warning(f"Embedding request rate limited, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                logger.error(f"Error generating batch embeddings: {e}")
+                raise
+    
+    @staticmethod
+    def _clean_texts(texts: List[str]) -> List[str]:
+        """Ensure every item is a non-empty string (API rejects empty/invalid input)"""
+        cleaned = []
+        for t in texts:
+            s = (t or "").strip() if isinstance(t, str) else str(t or "").strip()
+            cleaned.append(s if s else "(no text)")
+        return cleaned
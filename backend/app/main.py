@@ -14,13 +14,19 @@ os.environ["ANONYMIZED_TELEMETRY"] = "False"
 
 from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import List, Optional
+from fastapi.responses import JSONResponse, Response
+from typing import Dict, List, Optional, Sequence
+from collections import defaultdict
+from functools import lru_cache, partial, wraps
+from concurrent.futures import ThreadPoolExecutor
+import aiofiles
 import asyncio
 import gc
+import hashlib
+import json
 import logging
+import time
 from pathlib import Path
-import shutil
 from datetime import datetime
 
 from app.models import (
@@ -30,14 +36,13 @@ from app.models import (
     ComplianceReport,
     ESGFramework,
     ESGClause,
-    EvidenceType,
     GroundTruthLabel,
     ComplianceStatus
 )
 from app.config import settings
 from app.ingestion import DocumentProcessor
 from app.clause_parser_enhanced import EnhancedClauseParser
-from app.vector_store import VectorStore
+from app.vector_store import VectorStore, evidence_types_from_metadata
 from app.compliance_pipeline import CompliancePipeline
 from app.accuracy import AccuracyEvaluator
 
@@ -64,6 +69,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Shared pool for blocking work so it stays off the event loop
+executor = ThreadPoolExecutor(max_workers=settings.worker_threads, thread_name_prefix="esgbuddy")
+app.state.executor = executor
+
 # Global instances
 vector_store = VectorStore()
 compliance_pipeline = CompliancePipeline()
@@ -72,10 +81,17 @@ accuracy_evaluator = AccuracyEvaluator()
 # Controlled by USE_LLM_PARSING in .env (default: False = regex, True = LLM)
 clause_parser = EnhancedClauseParser(use_llm=settings.use_llm_parsing)
 
+# Read size when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # In-memory storage (replace with database in production)
 documents_metadata = {}
 compliance_reports = {}
 parsed_clauses = {}
+# Bumped whenever a report is stored or overridden; keys the clause-detail payload cache
+report_versions: Dict[str, int] = {}
+# Precomputed GET /clauses rows, keyed like parsed_clauses (see _refresh_clause_summaries)
+clause_summaries: Dict[str, List[dict]] = {}
 
 
 def _clauses_from_vector_store(rows: List[dict]) -> List[ESGClause]:
@@ -92,17 +108,8 @@ def _clauses_from_vector_store(rows: List[dict]) -> List[ESGClause]:
             framework = ESGFramework(fw_str)
         except ValueError:
             continue
-        evidence_str = meta.get("evidence_types") or ""
-        evidence_list = []
-        for x in evidence_str.split(","):
-            x = x.strip()
-            if not x:
-                continue
-            try:
-                evidence_list.append(EvidenceType(x))
-            except ValueError:
-                pass
-        keywords_str = meta.get("keywords") or ""
+        evidence_list = evidence_types_from_metadata(meta)
+        keywords_str = meta.get("keywords_blob", meta.get("keywords")) or ""
         keywords = [x.strip() for x in keywords_str.split(",") if x.strip()]
         clauses.append(ESGClause(
             clause_id=cid,
@@ -118,14 +125,91 @@ def _clauses_from_vector_store(rows: List[dict]) -> List[ESGClause]:
     return clauses
 
 
+def _clause_summary(c: ESGClause) -> dict:
+    """Build the GET /clauses row for a clause"""
+    return {
+        "clause_id": c.clause_id,
+        "framework": c.framework,
+        "section": c.section,
+        "title": c.title,
+        "description": c.description[:200] + "..." if len(c.description) > 200 else c.description,
+        "mandatory": c.mandatory,
+        "evidence_types": c.required_evidence_type
+    }
+
+
+def _refresh_clause_summaries():
+    """Rebuild clause_summaries from parsed_clauses; call after any parsed_clauses update."""
+    global clause_summaries
+    rows_by_clause = {}
+    summaries = {}
+    for key, clauses in list(parsed_clauses.items()):
+        rows = []
+        for c in clauses:
+            row = rows_by_clause.get(id(c))
+            if row is None:
+                row = rows_by_clause[id(c)] = _clause_summary(c)
+            rows.append(row)
+        summaries[key] = rows
+    clause_summaries = summaries
+
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking call on the shared worker pool and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(app.state.executor, partial(func, *args, **kwargs))
+
+
+def async_ttl_cache(ttl: float):
+    """Cache a zero-argument coroutine's result for `ttl` seconds (errors are not cached)"""
+    def decorator(func):
+        lock = asyncio.Lock()
+        last_time = 0.0
+        last_value = None
+        
+        @wraps(func)
+        async def wrapper():
+            nonlocal last_time, last_value
+            async with lock:
+                now = time.monotonic()
+                if last_value is None or now - last_time >= ttl:
+                    last_value = await func()
+                    last_time = now
+                return last_value
+        return wrapper
+    return decorator
+
+
 # ============= Startup & Health =============
 
+def _index_framework_clauses(framework: ESGFramework, clauses: Sequence[ESGClause]) -> bool:
+    """
+    Replace a framework's indexed clauses unless the parsed corpus is unchanged.
+    
+    Compares a hash of the parsed clauses with the one stored alongside the index,
+    so identical re-parses skip clearing and re-embedding.
+    
+    Returns:
+        True if the framework was re-indexed
+    """
+    corpus_hash = vector_store.compute_corpus_hash(clauses)
+    if corpus_hash == vector_store.get_corpus_hash(framework.value):
+        logger.info(f"{framework.value} clauses unchanged (corpus hash match), skipping re-indexing")
+        return False
+    
+    vector_store.clear_clauses(framework.value)
+    gc.collect()  # Clear memory after deletion
+    if clauses:
+        logger.info(f"Indexing {len(clauses)} {framework.value} clauses into vector store...")
+        vector_store.add_clauses(clauses)
+        logger.info(f"Indexed {len(clauses)} {framework.value} clauses into vector store")
+    vector_store.set_corpus_hash(corpus_hash, framework.value)
+    return True
+
+
 def _reparse_framework_sync(framework: ESGFramework):
     """Synchronous re-parse (runs in background thread to avoid blocking). Memory-optimized."""
     try:
-        vector_store.clear_clauses(framework.value)
-        gc.collect()  # Clear memory after deletion
-        
         clauses = clause_parser.parse_framework(framework)
         parsed_clauses[framework.value] = clauses
         
@@ -133,12 +217,11 @@ def _reparse_framework_sync(framework: ESGFramework):
         for f in ESGFramework:
             all_clauses.extend(parsed_clauses.get(f.value, []))
         parsed_clauses["all"] = all_clauses
+        _refresh_clause_summaries()
         
-        if clauses:
-            logger.info(f"Re-parsed {len(clauses)} {framework.value} clauses, indexing...")
-            vector_store.add_clauses(clauses)
-            logger.info(f"Indexed {len(clauses)} {framework.value} clauses into vector store")
-            logger.info(f"Total clauses for API: {len(all_clauses)}")
+        logger.info(f"Re-parsed {len(clauses)} {framework.value} clauses")
+        _index_framework_clauses(framework, clauses)
+        logger.info(f"Total clauses for API: {len(all_clauses)}")
         
         # Clear intermediate data
         del clauses
@@ -179,7 +262,7 @@ async def startup_event():
                     parsed_clauses[framework.value] = []
                 # Schedule background re-parse
                 loop = asyncio.get_event_loop()
-                loop.run_in_executor(None, _reparse_framework_sync, framework)
+                loop.run_in_executor(app.state.executor, _reparse_framework_sync, framework)
                 logger.info(f"Scheduled {framework.value} re-parse in background")
             else:
                 existing = vector_store.get_all_clauses(framework.value)
@@ -192,16 +275,21 @@ async def startup_event():
                     clauses = clause_parser.parse_framework(framework)
                     parsed_clauses[framework.value] = clauses
                     all_clauses.extend(clauses)
-                    if clauses:
-                        logger.info(f"Indexing {len(clauses)} {framework.value} clauses into vector store...")
-                        vector_store.add_clauses(clauses)
-                        logger.info(f"Indexed {len(clauses)} clauses into vector store")
+                    _index_framework_clauses(framework, clauses)
         parsed_clauses["all"] = all_clauses
+        _refresh_clause_summaries()
         logger.info(f"Startup complete. Total clauses for API: {len(all_clauses)} (TCFD re-parsing in background)")
     except Exception as e:
         logger.error(f"Error loading/parsing standards on startup: {e}")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the worker pool: queued jobs are cancelled, running ones finish in the background"""
+    logger.info("Shutting down ESGBuddy API")
+    app.state.executor.shutdown(wait=False, cancel_futures=True)
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -213,11 +301,23 @@ async def root():
     }
 
 
+@async_ttl_cache(ttl=1.0)
+async def _get_vector_stats() -> dict:
+    """Vector store stats, cached briefly so frequent probes don't hit Chroma each time"""
+    return vector_store.get_collection_stats()
+
+
+@app.get("/livez")
+async def liveness_check():
+    """Liveness probe: process is up and serving requests"""
+    return {"status": "ok"}
+
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (readiness: includes vector store stats)"""
     try:
-        stats = vector_store.get_collection_stats()
+        stats = await _get_vector_stats()
         return {
             "status": "healthy",
             "vector_store": stats,
@@ -248,16 +348,23 @@ async def upload_document(
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
     try:
-        # Save uploaded file
+        # Stream uploaded file to disk, hashing contents on the way through
         upload_path = Path(settings.upload_dir) / file.filename
-        with open(upload_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        hasher = hashlib.blake2b(digest_size=8)
+        async with aiofiles.open(upload_path, "wb") as buffer:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                hasher.update(chunk)
+                await buffer.write(chunk)
         
         # Process document
         processor = DocumentProcessor()
-        document_id = processor.generate_document_id(str(upload_path))
+        document_id = processor.generate_document_id(
+            str(upload_path),
+            content_digest=hasher.hexdigest()
+        )
         
-        chunks, metadata = processor.process_document(
+        chunks, metadata = await _run_blocking(
+            processor.process_document,
             pdf_path=str(upload_path),
             document_id=document_id
         )
@@ -266,7 +373,7 @@ async def upload_document(
         documents_metadata[document_id] = metadata
         
         # Add to vector store
-        vector_store.add_document_chunks(chunks)
+        await _run_blocking(vector_store.add_document_chunks, chunks)
         
         logger.info(f"Document {document_id} processed: {len(chunks)} chunks created")
         
@@ -344,27 +451,14 @@ async def get_clauses(framework: Optional[str] = None):
         framework: Filter by framework (BRSR, GRI, SASB, TCFD)
     """
     try:
-        if framework:
-            clauses = parsed_clauses.get(framework, [])
-        else:
-            clauses = parsed_clauses.get('all', [])
+        rows = clause_summaries.get(framework or 'all', [])
         
-        return {
-            "total": len(clauses),
+        # Rows are precomputed and JSON-safe, so skip FastAPI's jsonable_encoder pass
+        return JSONResponse(content={
+            "total": len(rows),
             "framework": framework or "all",
-            "clauses": [
-                {
-                    "clause_id": c.clause_id,
-                    "framework": c.framework.value,
-                    "section": c.section,
-                    "title": c.title,
-                    "description": c.description[:200] + "..." if len(c.description) > 200 else c.description,
-                    "mandatory": c.mandatory,
-                    "evidence_types": [et.value for et in c.required_evidence_type]
-                }
-                for c in clauses
-            ]
-        }
+            "clauses": rows
+        })
     except Exception as e:
         logger.error(f"Error getting clauses: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -381,12 +475,12 @@ async def get_clause_detail(clause_id: str):
     
     return {
         "clause_id": clause.clause_id,
-        "framework": clause.framework.value,
+        "framework": clause.framework,
         "section": clause.section,
         "title": clause.title,
         "description": clause.description,
         "mandatory": clause.mandatory,
-        "evidence_types": [et.value for et in clause.required_evidence_type],
+        "evidence_types": clause.required_evidence_type,
         "validation_rules": [
             {
                 "rule_id": r.rule_id,
@@ -428,7 +522,8 @@ async def evaluate_compliance(request: ClauseMatchRequest):
         
         # Run compliance evaluation
         metadata = documents_metadata[request.document_id]
-        report = compliance_pipeline.evaluate_document(
+        report = await _run_blocking(
+            compliance_pipeline.evaluate_document,
             document_id=request.document_id,
             clauses=clauses,
             document_metadata=metadata,
@@ -437,13 +532,14 @@ async def evaluate_compliance(request: ClauseMatchRequest):
         
         # Store report
         compliance_reports[report.report_id] = report
+        report_versions[report.report_id] = report_versions.get(report.report_id, 0) + 1
         
         logger.info(f"Compliance evaluation complete: {report.report_id}")
         
         return {
             "report_id": report.report_id,
             "document_id": report.document_id,
-            "framework": report.framework.value,
+            "framework": report.framework,
             "summary": report.summary,
             "generated_at": report.generated_at.isoformat()
         }
@@ -461,18 +557,18 @@ async def get_compliance_report(report_id: str):
     
     report = compliance_reports[report_id]
     
-    return {
+    data = {
         "report_id": report.report_id,
         "document_id": report.document_id,
         "document_filename": report.document_metadata.filename,
-        "framework": report.framework.value,
+        "framework": report.framework,
         "summary": report.summary,
         "generated_at": report.generated_at.isoformat(),
         "evaluations": [
             {
                 "clause_id": e.clause_id,
                 "clause_title": e.clause.title,
-                "final_status": e.final_status.value,
+                "final_status": e.final_status,
                 "final_confidence": e.final_confidence,
                 "evidence_count": len(e.retrieved_evidence),
                 "llm_explanation": e.llm_evaluation.explanation if e.llm_evaluation else None,
@@ -482,32 +578,41 @@ async def get_compliance_report(report_id: str):
             for e in report.evaluations
         ]
     }
+    
+    # JSON-safe as built (str enums encode as their values), so skip FastAPI's jsonable_encoder pass
+    return JSONResponse(content=data)
 
 
-@app.get("/compliance/reports/{report_id}/clause/{clause_id}")
-async def get_clause_evaluation_detail(report_id: str, clause_id: str):
-    """Get detailed evaluation for a specific clause"""
-    if report_id not in compliance_reports:
-        raise HTTPException(status_code=404, detail="Report not found")
+@lru_cache(maxsize=1024)
+def _clause_detail_payload(report_id: str, clause_id: str, version: int) -> Optional[bytes]:
+    """
+    Serialized clause evaluation detail, memoized per report version.
     
-    report = compliance_reports[report_id]
-    evaluation = next((e for e in report.evaluations if e.clause_id == clause_id), None)
+    `version` is report_versions[report_id]; bumping it on store/override makes
+    stale entries unreachable so they age out of the LRU.
     
-    if not evaluation:
-        raise HTTPException(status_code=404, detail="Clause evaluation not found")
+    Returns:
+        JSON bytes, or None if the report has no evaluation for the clause
+    """
+    report = compliance_reports.get(report_id)
+    if report is None:
+        return None
+    evaluation = next((e for e in report.evaluations if e.clause_id == clause_id), None)
+    if evaluation is None:
+        return None
     
-    return {
+    return json.dumps({
         "clause": {
             "clause_id": evaluation.clause.clause_id,
             "title": evaluation.clause.title,
             "description": evaluation.clause.description,
-            "framework": evaluation.clause.framework.value,
+            "framework": evaluation.clause.framework,
             "section": evaluation.clause.section
         },
-        "final_status": evaluation.final_status.value,
+        "final_status": evaluation.final_status,
         "final_confidence": evaluation.final_confidence,
         "llm_evaluation": {
-            "status": evaluation.llm_evaluation.status.value,
+            "status": evaluation.llm_evaluation.status,
             "confidence": evaluation.llm_evaluation.confidence,
             "explanation": evaluation.llm_evaluation.explanation,
             "reasoning": evaluation.llm_evaluation.reasoning
@@ -533,7 +638,21 @@ async def get_clause_evaluation_detail(report_id: str, clause_id: str):
         ],
         "override_applied": evaluation.override_applied,
         "override_reason": evaluation.override_reason
-    }
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+@app.get("/compliance/reports/{report_id}/clause/{clause_id}")
+async def get_clause_evaluation_detail(report_id: str, clause_id: str):
+    """Get detailed evaluation for a specific clause"""
+    if report_id not in compliance_reports:
+        raise HTTPException(status_code=404, detail="Report not found")
+    
+    payload = _clause_detail_payload(report_id, clause_id, report_versions.get(report_id, 0))
+    
+    if payload is None:
+        raise HTTPException(status_code=404, detail="Clause evaluation not found")
+    
+    return Response(content=payload, media_type="application/json")
 
 
 @app.post("/compliance/override")
@@ -557,14 +676,15 @@ async def override_clause_evaluation(request: ComplianceOverrideRequest):
     evaluation.final_status = request.new_status
     evaluation.override_applied = True
     evaluation.override_reason = f"Manual override: {request.reason}"
+    report_versions[request.report_id] = report_versions.get(request.report_id, 0) + 1
     
     logger.info(f"Override applied to {request.clause_id}: {old_status} -> {request.new_status}")
     
     return {
         "message": "Override applied successfully",
         "clause_id": request.clause_id,
-        "old_status": old_status.value,
-        "new_status": request.new_status.value
+        "old_status": old_status,
+        "new_status": request.new_status
     }
 
 
@@ -654,21 +774,21 @@ async def reparse_framework(framework: str):
                 detail=f"Invalid framework: {framework}. Must be one of: BRSR, GRI, SASB, TCFD"
             )
         logger.info(f"Re-parsing framework: {fw_upper}")
-        vector_store.clear_clauses(fw_upper)
-        clauses = clause_parser.parse_framework(fw_enum)
+        clauses = await _run_blocking(clause_parser.parse_framework, fw_enum)
         parsed_clauses[fw_enum.value] = clauses
         all_clauses = []
         for f in ESGFramework:
             all_clauses.extend(parsed_clauses.get(f.value, []))
         parsed_clauses["all"] = all_clauses
-        if clauses:
-            vector_store.add_clauses(clauses)
-            logger.info(f"Re-parsed and indexed {len(clauses)} {fw_upper} clauses")
+        _refresh_clause_summaries()
+        reindexed = await _run_blocking(_index_framework_clauses, fw_enum, clauses)
+        logger.info(f"Re-parsed {len(clauses)} {fw_upper} clauses (re-indexed: {reindexed})")
         return {
             "message": f"Framework {fw_upper} reparsed successfully",
             "framework": fw_upper,
             "clauses_count": len(clauses),
             "total_clauses": len(all_clauses),
+            "reindexed": reindexed,
         }
     except HTTPException:
         raise
@@ -690,36 +810,41 @@ async def reparse_standards(use_llm: bool = False):
     try:
         logger.info(f"Reparsing ESG standards (LLM parsing: {use_llm})")
         
-        # Clear existing clauses
-        vector_store.clear_clauses()
-        parsed_clauses.clear()
-        
         # Create parser with specified mode
         parser = EnhancedClauseParser(use_llm=use_llm)
         
         # Parse standards
-        clauses = parser.parse_all_standards()
+        clauses = await _run_blocking(parser.parse_all_standards)
         
         if clauses:
-            parsed_clauses['all'] = clauses
+            # Group by framework in a single pass
+            buckets = defaultdict(list)
+            for c in clauses:
+                buckets[c.framework.value].append(c)
             
-            # Group by framework
-            for framework in ESGFramework:
-                framework_clauses = [c for c in clauses if c.framework == framework]
-                parsed_clauses[framework.value] = framework_clauses
+            # Every key is overwritten below, so readers never see a cleared dict
+            parsed_clauses['all'] = tuple(clauses)
             
-            # Add to vector store
-            vector_store.add_clauses(clauses)
-            
-            logger.info(f"Reparsed and indexed {len(clauses)} clauses")
+            for framework in ESGFramework:
+                parsed_clauses[framework.value] = tuple(buckets.get(framework.value, ()))
+            _refresh_clause_summaries()
+
+            # Only frameworks whose corpus changed are re-indexed
+            reindexed = []
+            for framework in ESGFramework:
+                if await _run_blocking(_index_framework_clauses, framework, parsed_clauses[framework.value]):
+                    reindexed.append(framework.value)
+
+            logger.info(f"Reparsed {len(clauses)} clauses (re-indexed: {reindexed or 'none'})")
             
             return {
                 "message": "Standards reparsed successfully",
                 "total_clauses": len(clauses),
                 "by_framework": {
-                    framework.value: len(parsed_clauses[framework.value])
+                    framework.value: len(buckets.get(framework.value, ()))
                     for framework in ESGFramework
-                }
+                },
+                "reindexed_frameworks": reindexed
             }
         else:
             raise Exception("No clauses parsed from standards")
@@ -729,6 +854,21 @@ async def reparse_standards(use_llm: bool = False):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/system/clear-llm-cache")
+async def clear_llm_cache():
+    """
+    Clear cached LLM clause evaluations
+
+    Use this after prompt or model changes to force fresh LLM calls
+    """
+    cleared = compliance_pipeline.clear_llm_cache()
+    logger.info(f"Cleared {cleared} cached LLM evaluations")
+    return {
+        "message": "LLM cache cleared",
+        "entries_cleared": cleared
+    }
+
+
 @app.get("/system/stats")
 async def get_system_stats():
     """Get comprehensive system statistics"""
@@ -745,4 +885,17 @@ async def get_system_stats():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = max(1, settings.workers)
+    # loop/http "auto" pick uvloop + httptools when installed (uvicorn[standard]),
+    # falling back to asyncio/h11 on platforms without them (e.g. Windows).
+    # Multiple workers need an import string; a single worker gets the app object
+    # so this module (and its vector store, pipeline, parser, pool) isn't built twice.
+    uvicorn.run(
+        "app.main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        log_level=settings.log_level.lower()
+    )
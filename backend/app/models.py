@@ -3,7 +3,7 @@ ESGBuddy Data Models
 Pydantic models for type safety and validation
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
@@ -55,13 +55,15 @@ class DocumentChunk(BaseModel):
     page_number: int
     section: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
-    embedding: Optional[List[float]] = None
+    embedding: Optional[List[float]] = Field(default=None, exclude=True, repr=False)  # internal (vector store) only
 
 
 # ============= ESG Clause Models =============
 
 class ValidationRule(BaseModel):
     """Rule-based validation logic"""
+    model_config = ConfigDict(frozen=True)  # shared read-only across validator threads
+
     rule_id: str
     rule_type: Literal["numeric", "temporal", "keyword", "field_presence"]
     description: str
@@ -80,13 +82,20 @@ class ESGClause(BaseModel):
     mandatory: bool = True
     validation_rules: List[ValidationRule] = Field(default_factory=list)
     keywords: List[str] = Field(default_factory=list)
-    embedding: Optional[List[float]] = None
+    embedding: Optional[List[float]] = Field(default=None, exclude=True, repr=False)  # internal (vector store) only
+
+    def __reduce__(self):
+        # Pickle as field data re-validated on load, so pickled clause exports
+        # survive field additions/reordering instead of restoring a stale __dict__
+        return (self.__class__.model_validate, (self.model_dump(),))
 
 
 # ============= Compliance Evaluation Models =============
 
 class RetrievedEvidence(BaseModel):
     """Evidence chunk retrieved from documents"""
+    model_config = ConfigDict(frozen=True)  # shared read-only across validator threads
+
     chunk_id: str
     text: str
     page_number: int
@@ -97,6 +106,8 @@ class RetrievedEvidence(BaseModel):
 
 class RuleValidationResult(BaseModel):
     """Result from rule-based validation"""
+    model_config = ConfigDict(frozen=True)  # shared read-only across validator threads
+
     rule_id: str
     passed: bool
     message: str
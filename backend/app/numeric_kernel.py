@@ -0,0 +1,51 @@
+"""
+ESGBuddy Numeric Validation Kernel
+Range filtering for numeric rule validation, JIT-compiled with Numba when installed
+"""
+
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to vectorized NumPy
+    njit = None
+
+
+def _first_k_in_range_numpy(arr: np.ndarray, lo: float, hi: float, k: int) -> np.ndarray:
+    """NumPy fallback: mask the whole array, keep the first k indices"""
+    return np.flatnonzero((arr >= lo) & (arr <= hi))[:k]
+
+
+if njit is not None:
+    # Eager signature: compiled (or loaded from cache) at import, not on the first request
+    @njit("int64[:](float64[:], float64, float64, int64)", cache=True)
+    def _first_k_in_range_jit(arr, lo, hi, k):
+        out = np.empty(k, dtype=np.int64)
+        n = 0
+        for i in range(arr.shape[0]):
+            v = arr[i]
+            if v >= lo and v <= hi:
+                out[n] = i
+                n += 1
+                if n == k:
+                    break
+        return out[:n]
+
+    _kernel = _first_k_in_range_jit
+    logger.debug("Numeric validation kernel: Numba JIT")
+else:
+    _kernel = _first_k_in_range_numpy
+    logger.debug("Numeric validation kernel: NumPy fallback")
+
+
+def first_k_in_range(arr: np.ndarray, lo: float, hi: float, k: int) -> np.ndarray:
+    """
+    Indices of the first k values of arr within [lo, hi]
+
+    Stops scanning once k matches are found (Numba path).
+    """
+    return _kernel(np.ascontiguousarray(arr, dtype=np.float64), float(lo), float(hi), int(k))
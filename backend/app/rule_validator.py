@@ -3,23 +3,107 @@ ESGBuddy Rule-Based Validation Engine
 Deterministic rule validation to augment LLM decisions
 """
 
+import os
 import re
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Set
 from datetime import datetime
 import logging
 
+import ahocorasick
+import numpy as np
+
 from app.models import (
     ValidationRule, 
     RuleValidationResult, 
     RetrievedEvidence
 )
+from app.numeric_kernel import first_k_in_range
 
 logger = logging.getLogger(__name__)
 
+# Patterns compiled once at import (validators run for every rule of every clause)
+_NUMERIC_RE = re.compile(r'[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?')
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')  # non-capturing so findall returns full years
+# MM/DD/YYYY, MM-DD-YYYY or YYYY-MM-DD in a single scan
+_DATE_RE = re.compile(
+    r'\b(?:\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}-\d{1,2}-\d{2,4}|\d{4}-\d{1,2}-\d{1,2})\b'
+)
+# Time period keywords, matched by the shared pattern scan ('period' also covers 'reporting period')
+_PERIOD_KEYWORDS = ("period", "fiscal year", "quarter")
+
+
+class _ShortCircuitText:
+    """
+    Lowercased evidence, searched chunk by chunk
+    
+    Stands in for one big combined string: chunks are never concatenated,
+    and finditer lets callers stop at the first chunk that has an answer.
+    Matches never span two chunks.
+    """
+    
+    __slots__ = ("chunks",)
+    
+    def __init__(self, evidence: List[RetrievedEvidence]):
+        self.chunks = [e.text.lower() for e in evidence]
+    
+    def finditer(self, pattern: "re.Pattern") -> Iterator["re.Match"]:
+        """Lazily chain the pattern's matches over all chunks"""
+        return chain.from_iterable(pattern.finditer(chunk) for chunk in self.chunks)
+    
+    def findall(self, pattern: "re.Pattern") -> List[Any]:
+        """pattern.findall over all chunks, in chunk order"""
+        return [m for chunk in self.chunks for m in pattern.findall(chunk)]
+
+
+class _PatternHits(NamedTuple):
+    """Lowercased keywords/fields/period keywords found by the single multi-pattern scan of the evidence"""
+    keywords: Set[str]
+    fields: Set[str]
+    periods: Set[str]
+
+
+def _is_period_rule(rule: ValidationRule) -> bool:
+    """Temporal rules that fall through to the general period-keyword check"""
+    return rule.rule_type == "temporal" and rule.parameters.get("format", "year") not in ("year", "date")
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same definition of a word character as regex \\w"""
+    return ch.isalnum() or ch == "_"
+
+
+def _field_match_at(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] matches as `\\b<field>\\s*[:=]`"""
+    before_is_word = start > 0 and _is_word_char(text[start - 1])
+    if _is_word_char(text[start]) == before_is_word:
+        return False  # no word boundary before the field
+    i, n = end, len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    return i < n and text[i] in ":="
+
 
 class RuleValidator:
     """Execute rule-based validation on evidence"""
     
+    # Below this many rules, thread dispatch costs more than it saves
+    PARALLEL_MIN_RULES = 4
+    
+    def __init__(self):
+        self._pool = ThreadPoolExecutor(
+            max_workers=min(8, os.cpu_count() or 1),
+            thread_name_prefix="rule-validator"
+        )
+        # rule_type -> validator(rule, text_lower, hits)
+        self._dispatch = {
+            "numeric": self._validate_numeric,
+            "temporal": self._validate_temporal,
+            "keyword": self._validate_keyword,
+            "field_presence": self._validate_field_presence,
+        }
+    
     def validate_rules(
         self, 
         rules: List[ValidationRule],
@@ -35,58 +119,143 @@ class RuleValidator:
         Returns:
             List of validation results
         """
-        results = []
-        
-        # Combine all evidence text for validation
-        combined_evidence = " ".join([e.text for e in evidence])
+        # Keyword/field rules with nothing configured fail without looking at the text
+        results: List[Optional[RuleValidationResult]] = [self._noop_result(rule) for rule in rules]
+        active_rules = [(i, rule) for i, rule in enumerate(rules) if results[i] is None]
+        if not active_rules:
+            return results
+        
+        # Lowercased evidence shared by all rules: every validator matches
+        # case-insensitively, and chunks are searched one by one instead of
+        # being joined into one large string.
+        combined_lower = _ShortCircuitText(evidence)
+        
+        # One pass over the text for every keyword/field used by any rule
+        hits = self._scan_patterns([rule for _, rule in active_rules], combined_lower)
+        
+        # Rules are independent; fan out when there are enough to pay for dispatch.
+        # Futures are collected in submission order so results keep rule order.
+        if len(active_rules) >= self.PARALLEL_MIN_RULES:
+            futures = [
+                self._pool.submit(self._validate_single_rule, rule, combined_lower, evidence, hits)
+                for _, rule in active_rules
+            ]
+        else:
+            futures = None
         
-        for rule in rules:
+        for n, (i, rule) in enumerate(active_rules):
             try:
-                result = self._validate_single_rule(rule, combined_evidence, evidence)
-                results.append(result)
+                if futures is not None:
+                    results[i] = futures[n].result()
+                else:
+                    results[i] = self._validate_single_rule(rule, combined_lower, evidence, hits)
             except Exception as e:
                 logger.error(f"Error validating rule {rule.rule_id}: {e}")
-                results.append(RuleValidationResult(
+                results[i] = RuleValidationResult(
                     rule_id=rule.rule_id,
                     passed=False,
                     message=f"Rule validation error: {str(e)}",
                     triggered=False
-                ))
+                )
         
         return results
     
+    @staticmethod
+    def _noop_result(rule: ValidationRule) -> Optional[RuleValidationResult]:
+        """Canned failure for a keyword/field rule with no keywords/fields configured, else None"""
+        if rule.rule_type == "keyword" and not rule.parameters.get("keywords"):
+            message = "No keywords specified in rule"
+        elif rule.rule_type == "field_presence" and not rule.parameters.get("fields"):
+            message = "No fields specified in rule"
+        else:
+            return None
+        return RuleValidationResult(
+            rule_id=rule.rule_id,
+            passed=False,
+            message=message,
+            triggered=False
+        )
+    
+    def _scan_patterns(
+        self,
+        rules: List[ValidationRule],
+        text_lower: _ShortCircuitText
+    ) -> _PatternHits:
+        """
+        Find all keyword, field-presence and period patterns in one Aho-Corasick pass
+        
+        Linear in len(text) + total pattern length, instead of one substring/regex
+        sweep per keyword per rule. Stops after the chunk in which the last
+        pattern is found (any one period keyword is enough).
+        """
+        keywords = set()
+        fields = set()
+        periods = set()
+        for rule in rules:
+            if _is_period_rule(rule):
+                periods.update(_PERIOD_KEYWORDS)
+                continue
+            if rule.rule_type == "keyword":
+                target, values = keywords, rule.parameters.get("keywords") or []
+            elif rule.rule_type == "field_presence":
+                target, values = fields, rule.parameters.get("fields") or []
+            else:
+                continue
+            # Non-string values are left for the rule's own validator to report
+            target.update(v.lower() for v in values if isinstance(v, str) and v)
+        
+        hits = _PatternHits(keywords=set(), fields=set(), periods=set())
+        if not keywords and not fields and not periods:
+            return hits
+        
+        automaton = ahocorasick.Automaton()
+        for pattern in keywords | fields | periods:
+            automaton.add_word(
+                pattern,
+                (pattern, pattern in keywords, pattern in fields, pattern in periods)
+            )
+        automaton.make_automaton()
+        
+        for chunk in text_lower.chunks:
+            for end_index, (pattern, is_keyword, is_field, is_period) in automaton.iter(chunk):
+                if is_keyword:
+                    hits.keywords.add(pattern)
+                if is_period:
+                    hits.periods.add(pattern)
+                if is_field and pattern not in hits.fields:
+                    start = end_index - len(pattern) + 1
+                    if _field_match_at(chunk, start, end_index + 1):
+                        hits.fields.add(pattern)
+            if (len(hits.keywords) == len(keywords)
+                    and len(hits.fields) == len(fields)
+                    and (hits.periods or not periods)):
+                break  # everything found; remaining chunks cannot change the result
+        
+        return hits
+    
     def _validate_single_rule(
         self, 
         rule: ValidationRule,
-        combined_text: str,
-        evidence: List[RetrievedEvidence]
+        combined_lower: _ShortCircuitText,
+        evidence: List[RetrievedEvidence],
+        hits: _PatternHits
     ) -> RuleValidationResult:
-        """Validate a single rule"""
-        
-        if rule.rule_type == "numeric":
-            return self._validate_numeric(rule, combined_text)
-        
-        elif rule.rule_type == "temporal":
-            return self._validate_temporal(rule, combined_text)
-        
-        elif rule.rule_type == "keyword":
-            return self._validate_keyword(rule, combined_text)
-        
-        elif rule.rule_type == "field_presence":
-            return self._validate_field_presence(rule, combined_text)
-        
-        else:
+        """Validate a single rule against the shared, already-lowercased evidence"""
+        validator = self._dispatch.get(rule.rule_type)
+        if validator is None:
             return RuleValidationResult(
                 rule_id=rule.rule_id,
                 passed=False,
                 message=f"Unknown rule type: {rule.rule_type}",
                 triggered=False
             )
+        return validator(rule, combined_lower, hits)
     
     def _validate_numeric(
         self, 
         rule: ValidationRule, 
-        text: str
+        text_lower: _ShortCircuitText,
+        hits: _PatternHits
     ) -> RuleValidationResult:
         """
         Validate numeric evidence
@@ -99,8 +268,7 @@ class RuleValidator:
         params = rule.parameters
         
         # Find numeric values in text
-        numeric_pattern = r'[-+]?[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?'
-        numbers = re.findall(numeric_pattern, text)
+        numbers = text_lower.findall(_NUMERIC_RE)
         
         if not numbers:
             return RuleValidationResult(
@@ -114,20 +282,14 @@ class RuleValidator:
         min_value = params.get("min_value", float('-inf'))
         max_value = params.get("max_value", float('inf'))
         
-        valid_numbers = []
-        for num_str in numbers:
-            try:
-                num = float(num_str)
-                if min_value <= num <= max_value:
-                    valid_numbers.append(num)
-            except ValueError:
-                continue
+        values = self._parse_numbers(numbers)
+        valid_idx = first_k_in_range(values, min_value, max_value, 3)
         
-        if valid_numbers:
+        if valid_idx.size:
             return RuleValidationResult(
                 rule_id=rule.rule_id,
                 passed=True,
-                message=f"Found valid numeric values: {valid_numbers[:3]}",
+                message=f"Found valid numeric values: {values[valid_idx].tolist()}",
                 triggered=True
             )
         else:
@@ -138,10 +300,25 @@ class RuleValidator:
                 triggered=True
             )
     
+    @staticmethod
+    def _parse_numbers(numbers: List[str]) -> np.ndarray:
+        """Convert numeric tokens to a float64 array in one call, skipping unparsable tokens"""
+        try:
+            return np.array(numbers, dtype=np.float64)
+        except ValueError:
+            values = []
+            for num_str in numbers:
+                try:
+                    values.append(float(num_str))
+                except ValueError:
+                    continue
+            return np.array(values, dtype=np.float64)
+    
     def _validate_temporal(
         self, 
         rule: ValidationRule, 
-        text: str
+        text_lower: _ShortCircuitText,
+        hits: _PatternHits
     ) -> RuleValidationResult:
         """
         Validate time period references
@@ -156,10 +333,21 @@ class RuleValidator:
         
         if format_type == "year":
             # Find 4-digit years
-            year_pattern = r'\b(19|20)\d{2}\b'
-            years = re.findall(year_pattern, text)
+            min_year = params.get("min_year", 1900)
+            max_year = params.get("max_year", datetime.now().year)
             
-            if not years:
+            # Check year validity; stop once enough valid years are found
+            any_year = False
+            valid_years = []
+            for match in text_lower.finditer(_YEAR_RE):
+                any_year = True
+                year = match.group()
+                if min_year <= int(year) <= max_year:
+                    valid_years.append(year)
+                    if len(valid_years) == 5:
+                        break
+            
+            if not any_year:
                 return RuleValidationResult(
                     rule_id=rule.rule_id,
                     passed=False,
@@ -167,17 +355,11 @@ class RuleValidator:
                     triggered=True
                 )
             
-            # Check year validity
-            min_year = params.get("min_year", 1900)
-            max_year = params.get("max_year", datetime.now().year)
-            
-            valid_years = [y for y in years if min_year <= int(y) <= max_year]
-            
             if valid_years:
                 return RuleValidationResult(
                     rule_id=rule.rule_id,
                     passed=True,
-                    message=f"Found valid years: {valid_years[:5]}",
+                    message=f"Found valid years: {valid_years}",
                     triggered=True
                 )
             else:
@@ -190,21 +372,13 @@ class RuleValidator:
         
         elif format_type == "date":
             # Look for date patterns
-            date_patterns = [
-                r'\b\d{1,2}/\d{1,2}/\d{2,4}\b',  # MM/DD/YYYY
-                r'\b\d{1,2}-\d{1,2}-\d{2,4}\b',  # MM-DD-YYYY
-                r'\b\d{4}-\d{1,2}-\d{1,2}\b'     # YYYY-MM-DD
-            ]
-            
-            dates_found = []
-            for pattern in date_patterns:
-                dates_found.extend(re.findall(pattern, text))
+            dates_found = [m.group() for m in islice(text_lower.finditer(_DATE_RE), 3)]
             
             if dates_found:
                 return RuleValidationResult(
                     rule_id=rule.rule_id,
                     passed=True,
-                    message=f"Found dates: {dates_found[:3]}",
+                    message=f"Found dates: {dates_found}",
                     triggered=True
                 )
             else:
@@ -217,8 +391,7 @@ class RuleValidator:
         
         else:
             # General period check
-            period_keywords = ['period', 'fiscal year', 'quarter', 'reporting period']
-            if any(kw in text.lower() for kw in period_keywords):
+            if hits.periods:
                 return RuleValidationResult(
                     rule_id=rule.rule_id,
                     passed=True,
@@ -236,7 +409,8 @@ class RuleValidator:
     def _validate_keyword(
         self, 
         rule: ValidationRule, 
-        text: str
+        text_lower: _ShortCircuitText,
+        hits: _PatternHits
     ) -> RuleValidationResult:
         """
         Validate presence of specific keywords
@@ -250,15 +424,9 @@ class RuleValidator:
         match_all = params.get("match_all", False)
         
         if not keywords:
-            return RuleValidationResult(
-                rule_id=rule.rule_id,
-                passed=False,
-                message="No keywords specified in rule",
-                triggered=False
-            )
+            return self._noop_result(rule)
         
-        text_lower = text.lower()
-        found_keywords = [kw for kw in keywords if kw.lower() in text_lower]
+        found_keywords = [kw for kw in keywords if not kw or kw.lower() in hits.keywords]
         
         if match_all:
             passed = len(found_keywords) == len(keywords)
@@ -277,7 +445,8 @@ class RuleValidator:
     def _validate_field_presence(
         self, 
         rule: ValidationRule, 
-        text: str
+        text_lower: _ShortCircuitText,
+        hits: _PatternHits
     ) -> RuleValidationResult:
         """
         Validate presence of required fields
@@ -289,21 +458,10 @@ class RuleValidator:
         fields = params.get("fields", [])
         
         if not fields:
-            return RuleValidationResult(
-                rule_id=rule.rule_id,
-                passed=False,
-                message="No fields specified in rule",
-                triggered=False
-            )
-        
-        text_lower = text.lower()
-        found_fields = []
+            return self._noop_result(rule)
         
-        for field in fields:
-            # Look for field name followed by colon or similar
-            field_pattern = rf'\b{re.escape(field.lower())}\s*[:=]'
-            if re.search(field_pattern, text_lower):
-                found_fields.append(field)
+        # Field name followed by colon or similar (verified during the pattern scan)
+        found_fields = [field for field in fields if field.lower() in hits.fields]
         
         passed = len(found_fields) == len(fields)
         
@@ -5,18 +5,141 @@ Handles embedding storage and semantic retrieval using ChromaDB
 
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable, Iterator
 import logging
 import gc
+import threading
+from collections import OrderedDict
+import hashlib
+import json
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
-from app.models import DocumentChunk, ESGClause, RetrievedEvidence
+from app.models import DocumentChunk, ESGClause, RetrievedEvidence, EvidenceType
 from app.config import settings
 from app.ingestion import EmbeddingGenerator
 
 logger = logging.getLogger(__name__)
 
 
+# Clause metadata layout; part of the corpus hash so a layout change triggers a reindex
+CLAUSE_METADATA_VERSION = 4
+# Per-EvidenceType boolean metadata key, e.g. "et_numeric" (filterable with where={"et_numeric": True})
+EVIDENCE_TYPE_KEY_PREFIX = "et_"
+
+
+# Enum <-> str tables built once at import (clause metadata is built/read per clause)
+_EVIDENCE_TYPE_VALUES: Dict[EvidenceType, str] = {et: et.value for et in EvidenceType}
+_EVIDENCE_TYPE_BY_VALUE: Dict[str, EvidenceType] = {et.value: et for et in EvidenceType}
+_EVIDENCE_TYPE_FLAG_KEYS: Dict[EvidenceType, str] = {
+    et: f"{EVIDENCE_TYPE_KEY_PREFIX}{et.value}" for et in EvidenceType
+}
+
+
+def evidence_type_flags(evidence_types: Iterable[EvidenceType]) -> Dict[str, bool]:
+    """One boolean metadata flag per EvidenceType value"""
+    present = set(evidence_types)
+    return {key: et in present for et, key in _EVIDENCE_TYPE_FLAG_KEYS.items()}
+
+
+def evidence_types_from_metadata(metadata: Dict[str, Any]) -> List[EvidenceType]:
+    """Read evidence types back from clause metadata (flags, or the legacy comma-joined string)"""
+    if "evidence_types" in metadata:
+        evidence_types = []
+        for value in (metadata.get("evidence_types") or "").split(","):
+            et = _EVIDENCE_TYPE_BY_VALUE.get(value.strip())
+            if et is not None:
+                evidence_types.append(et)
+        return evidence_types
+    return [et for et, key in _EVIDENCE_TYPE_FLAG_KEYS.items() if metadata.get(key)]
+
+
+# ChromaDB where filters are rebuilt for every search otherwise. The cached dicts are
+# shared between calls, so they are passed straight to ChromaDB and never mutated.
+
+@lru_cache(maxsize=256)
+def _cached_document_where(
+    document_id: Optional[str],
+    extras: Optional[Tuple[Tuple[str, Any], ...]]
+) -> Optional[Dict[str, Any]]:
+    """Build the documents where filter for a document id plus (sorted, hashable) extra filters"""
+    where = {}
+    if document_id:
+        where["document_id"] = document_id
+    if extras:
+        where.update(extras)
+    return where or None
+
+
+def _document_where(
+    document_id: Optional[str],
+    filter_metadata: Optional[Dict[str, Any]]
+) -> Tuple[Any, Optional[Dict[str, Any]]]:
+    """
+    (group key, where filter) for a documents search
+    
+    Filters with unhashable values (operator filters such as {"$in": [...]})
+    bypass the cache and are keyed by their canonical JSON instead.
+    """
+    extras = tuple(sorted(filter_metadata.items())) if filter_metadata else None
+    try:
+        return (document_id or None, extras), _cached_document_where(document_id or None, extras)
+    except TypeError:
+        where = {"document_id": document_id} if document_id else {}
+        where.update(filter_metadata)
+        return json.dumps(where, sort_keys=True, default=str), where
+
+
+@lru_cache(maxsize=64)
+def _clause_where(
+    framework: Optional[str],
+    evidence_type: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    """Build the clauses where filter for a framework and/or evidence type value"""
+    conditions = []
+    if framework:
+        conditions.append({"framework": framework})
+    if evidence_type:
+        conditions.append({f"{EVIDENCE_TYPE_KEY_PREFIX}{evidence_type}": True})
+    if len(conditions) > 1:
+        return {"$and": conditions}
+    return conditions[0] if conditions else None
+
+
+class CorpusHasher:
+    """
+    Order-independent, incremental corpus hash over corpus_hash_entry() values
+    
+    Each entry is hashed on its own and the digests are summed mod 2**256, so
+    memory stays constant however many clauses are streamed through update().
+    """
+    
+    _MASK = (1 << 256) - 1
+    
+    def __init__(self):
+        self._total = 0
+        self._count = 0
+    
+    def update(self, entry: bytes):
+        digest = int.from_bytes(hashlib.sha256(entry).digest(), "big")
+        self._total = (self._total + digest) & self._MASK
+        self._count += 1
+    
+    def hexdigest(self) -> str:
+        return hashlib.sha256(f"{self._count}:{self._total:064x}".encode("ascii")).hexdigest()
+
+
+def _iter_batches(items: Iterable, batch_size: int) -> Iterator[list]:
+    """Yield successive lists of up to batch_size items without materializing the input"""
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 class VectorStore:
     """Manage vector embeddings for semantic search"""
     
@@ -24,6 +147,11 @@ class VectorStore:
         self.persist_directory = settings.chroma_persist_directory
         self.embedding_generator = EmbeddingGenerator()
         
+        # LRU cache of query embeddings keyed by model + query hash
+        self._query_emb_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_emb_cache_size = settings.query_embedding_cache_size
+        self._query_emb_cache_lock = threading.Lock()  # searches may run on worker threads
+        
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(
             path=self.persist_directory,
@@ -43,15 +171,13 @@ class VectorStore:
         """Initialize or get existing collections"""
         try:
             # Documents collection
-            self.documents_collection = self.client.get_or_create_collection(
-                name="company_documents",
-                metadata={"description": "Company ESG documents and reports"}
+            self.documents_collection = self._get_or_create_collection(
+                "company_documents", "Company ESG documents and reports"
             )
             
-            # Clauses collection
-            self.clauses_collection = self.client.get_or_create_collection(
-                name="esg_clauses",
-                metadata={"description": "ESG standard clauses"}
+            # Clauses collection (its metadata also holds the per-framework corpus hashes)
+            self.clauses_collection = self._get_or_create_collection(
+                "esg_clauses", "ESG standard clauses"
             )
             
             logger.info("Vector store collections initialized")
@@ -60,65 +186,102 @@ class VectorStore:
             logger.error(f"Error initializing collections: {e}")
             raise
     
+    def _get_or_create_collection(self, name: str, description: str):
+        """
+        Get a collection, creating it with a description on a miss
+        
+        Unlike client.get_or_create_collection(metadata=...), which replaces an
+        existing collection's differing metadata, this keeps stored metadata
+        (the corpus hashes) across VectorStore instances and restarts.
+        """
+        try:
+            return self.client.get_collection(name=name)
+        except ValueError:
+            return self.client.create_collection(name=name, metadata={"description": description})
+    
     # ============= Document Operations =============
     
     def add_document_chunks(
         self, 
-        chunks: List[DocumentChunk],
+        chunks: Iterable[DocumentChunk],
         batch_size: int = 100
     ) -> int:
         """
         Add document chunks to vector store
         
+        Chunks are consumed a few batches at a time (embed missing vectors
+        concurrently, then add batch by batch), so memory stays bounded.
+        If a batch fails, chunks already added for this call are removed again.
+        
         Args:
-            chunks: List of document chunks with embeddings
-            batch_size: Batch size for adding embeddings
+            chunks: Document chunks (list or any iterable), with or without embeddings
+            batch_size: Batch size for generating and adding embeddings
         
         Returns:
             Number of chunks added
         """
-        logger.info(f"Adding {len(chunks)} chunks to vector store")
-        
-        # Generate embeddings if not present
-        chunks_without_embeddings = [c for c in chunks if c.embedding is None]
-        if chunks_without_embeddings:
-            logger.info(f"Generating embeddings for {len(chunks_without_embeddings)} chunks")
-            texts = [c.text for c in chunks_without_embeddings]
-            
-            # Generate in batches
-            for i in range(0, len(texts), batch_size):
-                batch_texts = texts[i:i+batch_size]
-                batch_embeddings = self.embedding_generator.generate_embeddings_batch(batch_texts)
+        added_ids: List[str] = []
+        try:
+            batches = self._embedded_batches(chunks, batch_size, lambda c: c.text)
+            for batch_num, batch in enumerate(batches, start=1):
+                ids = [c.chunk_id for c in batch]
+                self.documents_collection.add(
+                    ids=ids,
+                    embeddings=[c.embedding for c in batch],
+                    documents=[c.text for c in batch],
+                    metadatas=[
+                        {
+                            "document_id": c.document_id,
+                            "page_number": c.page_number,
+                            "section": c.section or "",
+                            **c.metadata
+                        }
+                        for c in batch
+                    ]
+                )
+                added_ids.extend(ids)
                 
-                for j, embedding in enumerate(batch_embeddings):
-                    chunks_without_embeddings[i+j].embedding = embedding
+                # Clear batch data after adding to DB
+                del ids, batch
+                if batch_num % 10 == 0:  # GC every 10 batches
+                    gc.collect()
+        except Exception:
+            if added_ids:
+                logger.error(f"Adding chunks failed, removing {len(added_ids)} chunks added so far")
+                self.documents_collection.delete(ids=added_ids)
+            raise
         
-        # Add to ChromaDB in batches
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i:i+batch_size]
-            
-            ids = [c.chunk_id for c in batch]
-            embeddings = [c.embedding for c in batch]
-            documents = [c.text for c in batch]
-            metadatas = [
-                {
-                    "document_id": c.document_id,
-                    "page_number": c.page_number,
-                    "section": c.section or "",
-                    **c.metadata
-                }
-                for c in batch
-            ]
-            
-            self.documents_collection.add(
-                ids=ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
+        logger.info(f"Successfully added {len(added_ids)} chunks to vector store")
+        return len(added_ids)
+    
+    def _embedded_batches(
+        self,
+        items: Iterable[Any],
+        batch_size: int,
+        text_of: Callable[[Any], str]
+    ) -> Iterator[list]:
+        """
+        Yield batches of items whose missing embeddings have been filled in
         
-        logger.info(f"Successfully added {len(chunks)} chunks to vector store")
-        return len(chunks)
+        Reads settings.embedding_concurrency batches at a time and embeds them
+        with that many requests in flight; ChromaDB inserts stay sequential.
+        """
+        window_size = batch_size * max(1, settings.embedding_concurrency)
+        for window in _iter_batches(items, window_size):
+            missing = [item for item in window if item.embedding is None]
+            if missing:
+                groups = [missing[i:i+batch_size] for i in range(0, len(missing), batch_size)]
+                results = self.embedding_generator.generate_embeddings_batches(
+                    [[text_of(item) for item in group] for group in groups]
+                )
+                for group, embeddings in zip(groups, results):
+                    for item, embedding in zip(group, embeddings):
+                        item.embedding = embedding
+                
+                # Clear batch data after processing to free memory
+                del missing, groups, results
+            
+            yield from _iter_batches(window, batch_size)
     
     def search_documents(
         self,
@@ -139,39 +302,126 @@ class VectorStore:
         Returns:
             List of retrieved evidence
         """
+        return self.search_documents_batch(
+            [query],
+            document_ids=[document_id],
+            top_k=top_k,
+            filter_metadatas=[filter_metadata]
+        )[0]
+    
+    def search_documents_batch(
+        self,
+        queries: List[str],
+        document_ids: Optional[List[Optional[str]]] = None,
+        top_k: int = None,
+        filter_metadatas: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List[List[RetrievedEvidence]]:
+        """
+        Semantic search for several queries with one embedding call
+        
+        Queries sharing the same filter go to ChromaDB in a single query.
+        
+        Args:
+            queries: Search query texts
+            document_ids: Per-query document filter (optional, parallel to queries)
+            top_k: Number of results to return per query
+            filter_metadatas: Per-query additional metadata filters (optional, parallel to queries)
+        
+        Returns:
+            One list of retrieved evidence per query, in query order
+        """
+        if not queries:
+            return []
+        
         top_k = top_k or settings.top_k_chunks
+        document_ids = document_ids or [None] * len(queries)
+        filter_metadatas = filter_metadatas or [None] * len(queries)
         
-        # Generate query embedding
-        query_embedding = self.embedding_generator.generate_embedding(query)
-        
-        # Build where clause for filtering
-        where = {}
-        if document_id:
-            where["document_id"] = document_id
-        if filter_metadata:
-            where.update(filter_metadata)
-        
-        # Search
-        results = self.documents_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k,
-            where=where if where else None
-        )
+        query_embeddings = self._embed_queries(queries)
+        
+        # Group queries by where clause; each group is one ChromaDB query
+        groups: Dict[Any, Tuple[Optional[Dict[str, Any]], List[int]]] = {}
+        for q_idx, (document_id, filter_metadata) in enumerate(zip(document_ids, filter_metadatas)):
+            key, where = _document_where(document_id, filter_metadata)
+            groups.setdefault(key, (where, []))[1].append(q_idx)
+        
+        all_evidence: List[List[RetrievedEvidence]] = [[] for _ in queries]
+        for where, indices in groups.values():
+            results = self.documents_collection.query(
+                query_embeddings=[query_embeddings[q_idx] for q_idx in indices],
+                n_results=top_k,
+                where=where
+            )
+            
+            # Convert to RetrievedEvidence
+            for r, q_idx in enumerate(indices):
+                if not results['ids'] or not results['ids'][r]:
+                    continue
+                evidence = all_evidence[q_idx]
+                rows = zip(
+                    results['ids'][r],
+                    results['documents'][r],
+                    results['metadatas'][r],
+                    results['distances'][r]
+                )
+                for chunk_id, text, meta, distance in rows:
+                    # Values come straight from ChromaDB rows we wrote; skip re-validation
+                    evidence.append(RetrievedEvidence.model_construct(
+                        chunk_id=chunk_id,
+                        text=text,
+                        page_number=meta.get('page_number', 0),
+                        section=meta.get('section'),
+                        similarity_score=1 - distance,  # Convert distance to similarity
+                        document_id=meta.get('document_id', '')
+                    ))
+        
+        return all_evidence
+    
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed search queries, serving repeats from the LRU cache and the rest in one request"""
+        keys = [self._query_emb_cache_key(q) for q in queries]
+        embeddings: List[Optional[List[float]]] = [None] * len(queries)
+        with self._query_emb_cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._query_emb_cache.get(key)
+                if cached is not None:
+                    self._query_emb_cache.move_to_end(key)
+                    embeddings[i] = cached
         
-        # Convert to RetrievedEvidence
-        evidence = []
-        if results['ids'] and len(results['ids'][0]) > 0:
-            for i in range(len(results['ids'][0])):
-                evidence.append(RetrievedEvidence(
-                    chunk_id=results['ids'][0][i],
-                    text=results['documents'][0][i],
-                    page_number=results['metadatas'][0][i].get('page_number', 0),
-                    section=results['metadatas'][0][i].get('section'),
-                    similarity_score=1 - results['distances'][0][i],  # Convert distance to similarity
-                    document_id=results['metadatas'][0][i].get('document_id', '')
-                ))
-        
-        return evidence
+        # Embed each distinct missing query once
+        misses: Dict[str, List[int]] = {}
+        for i, emb in enumerate(embeddings):
+            if emb is None:
+                misses.setdefault(keys[i], []).append(i)
+        if misses:
+            generated = self.embedding_generator.generate_embeddings_batch(
+                [queries[indices[0]] for indices in misses.values()]
+            )
+            for indices, embedding in zip(misses.values(), generated):
+                for i in indices:
+                    embeddings[i] = embedding
+            self._store_query_embeddings(list(misses), generated)
+        
+        return embeddings
+    
+    def _query_emb_cache_key(self, query: str) -> str:
+        """Fixed-size key for a query; includes the model so a model change never hits stale vectors"""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(self.embedding_generator.model.encode("utf-8"))
+        h.update(b"\x00")
+        h.update(query.encode("utf-8"))
+        return h.hexdigest()
+    
+    def _store_query_embeddings(self, keys: List[str], embeddings: List[List[float]]):
+        """Insert into the query embedding cache, evicting least recently used entries"""
+        if self._query_emb_cache_size <= 0:
+            return
+        with self._query_emb_cache_lock:
+            for key, embedding in zip(keys, embeddings):
+                self._query_emb_cache[key] = embedding
+                self._query_emb_cache.move_to_end(key)
+            while len(self._query_emb_cache) > self._query_emb_cache_size:
+                self._query_emb_cache.popitem(last=False)
     
     def delete_document(self, document_id: str) -> int:
         """
@@ -196,54 +446,39 @@ class VectorStore:
     
     def add_clauses(
         self, 
-        clauses: List[ESGClause],
+        clauses: Iterable[ESGClause],
         batch_size: int = 20  # Reduced from 50 to reduce memory usage
     ) -> int:
         """
         Add ESG clauses to vector store
         
+        Clauses are consumed a few batches at a time (embed missing vectors
+        concurrently, then add), so an iterator (e.g. a streaming JSON import)
+        is never fully materialized.
+        
         Args:
-            clauses: List of ESG clauses
+            clauses: ESG clauses (list or any iterable)
             batch_size: Batch size for processing
         
         Returns:
             Number of clauses added
         """
-        logger.info(f"Adding {len(clauses)} clauses to vector store")
-        
-        # Generate embeddings for clause descriptions
-        clauses_without_embeddings = [c for c in clauses if c.embedding is None]
-        if clauses_without_embeddings:
-            logger.info(f"Generating embeddings for {len(clauses_without_embeddings)} clauses")
-            
-            def sanitize_for_embedding(text: str, max_chars: int = 8000) -> str:
-                """Ensure text is valid for OpenAI embeddings API."""
-                if text is None or not isinstance(text, str):
-                    return "(no description)"
-                s = str(text).strip()
-                if not s:
-                    return "(no description)"
-                return s[:max_chars] if len(s) > max_chars else s
-            
-            for i in range(0, len(clauses_without_embeddings), batch_size):
-                batch = clauses_without_embeddings[i:i+batch_size]
-                batch_descriptions = [sanitize_for_embedding(c.description) for c in batch]
-                batch_embeddings = self.embedding_generator.generate_embeddings_batch(batch_descriptions)
-                
-                for j, embedding in enumerate(batch_embeddings):
-                    batch[j].embedding = embedding
-                
-                # Clear batch data after processing to free memory
-                del batch_descriptions
-                del batch_embeddings
-                if (i // batch_size) % 5 == 0:  # GC every 5 batches
-                    gc.collect()
+        def sanitize_for_embedding(text: str, max_chars: int = 8000) -> str:
+            """Ensure text is valid for OpenAI embeddings API."""
+            if text is None or not isinstance(text, str):
+                return "(no description)"
+            s = str(text).strip()
+            if not s:
+                return "(no description)"
+            return s[:max_chars] if len(s) > max_chars else s
         
-        # Add to ChromaDB (use unique id per clause to avoid duplicate-id errors)
-        for i in range(0, len(clauses), batch_size):
-            batch = clauses[i:i+batch_size]
-            
-            ids = [f"{c.clause_id}_{i + j}" for j, c in enumerate(batch)]
+        total_added = 0
+        batches = self._embedded_batches(
+            clauses, batch_size, lambda c: sanitize_for_embedding(c.description)
+        )
+        for batch_num, batch in enumerate(batches):
+            # Add to ChromaDB (use unique id per clause to avoid duplicate-id errors)
+            ids = [f"{c.clause_id}_{total_added + j}" for j, c in enumerate(batch)]
             embeddings = [c.embedding for c in batch]
             documents = [c.description for c in batch]
             metadatas = [
@@ -252,8 +487,9 @@ class VectorStore:
                     "section": c.section or "",
                     "title": c.title,
                     "mandatory": c.mandatory,
-                    "evidence_types": ",".join([et.value for et in c.required_evidence_type]),
-                    "keywords": ",".join(c.keywords),
+                    **evidence_type_flags(c.required_evidence_type),
+                    # Original case: read back as ESGClause.keywords (matchers lowercase on their own)
+                    "keywords_blob": ",".join(kw.strip() for kw in c.keywords),
                     "clause_id": c.clause_id,
                 }
                 for c in batch
@@ -265,15 +501,14 @@ class VectorStore:
                 documents=documents,
                 metadatas=metadatas
             )
+            total_added += len(batch)
             
             # Clear batch data after adding to DB
             del ids, embeddings, documents, metadatas, batch
-            if (i // batch_size) % 3 == 0:  # GC every 3 batches
+            if batch_num % 3 == 0:  # GC every 3 batches
                 gc.collect()
         
-        total_added = len(clauses)
         logger.info(f"Successfully added {total_added} clauses to vector store")
-        del clauses  # Clear clauses list after processing
         gc.collect()
         return total_added
     
@@ -299,15 +534,19 @@ class VectorStore:
     
     def get_all_clauses(
         self, 
-        framework: Optional[str] = None
+        framework: Optional[str] = None,
+        evidence_type: Optional[EvidenceType] = None
     ) -> List[Dict[str, Any]]:
         """
-        Get all clauses, optionally filtered by framework
+        Get all clauses, optionally filtered by framework and/or required evidence type
         
         Returns:
             List of clause dictionaries
         """
-        where = {"framework": framework} if framework else None
+        where = _clause_where(
+            framework or None,
+            EvidenceType(evidence_type).value if evidence_type else None
+        )
         
         try:
             results = self.clauses_collection.get(
@@ -330,6 +569,30 @@ class VectorStore:
             logger.error(f"Error getting clauses: {e}")
             return []
     
+    def delete_clauses(self, clause_ids: Iterable[str], framework: str) -> int:
+        """
+        Delete every indexed entry of the given clause ids within a framework
+        
+        Used to apply incremental clause imports; the framework's corpus hash
+        no longer describes the collection afterwards and is cleared.
+        
+        Returns:
+            Number of entries deleted
+        """
+        clause_ids = set(clause_ids)
+        if not clause_ids:
+            return 0
+        results = self.clauses_collection.get(where={"framework": framework}, include=["metadatas"])
+        ids = [
+            entry_id for entry_id, meta in zip(results['ids'], results['metadatas'])
+            if (meta or {}).get("clause_id") in clause_ids
+        ]
+        if ids:
+            self.clauses_collection.delete(ids=ids)
+            logger.info(f"Deleted {len(ids)} entries for {len(clause_ids)} {framework} clause ids")
+        self.set_corpus_hash(None, framework)
+        return len(ids)
+    
     def clear_clauses(self, framework: Optional[str] = None):
         """Clear all clauses, optionally for a specific framework"""
         if framework:
@@ -337,6 +600,7 @@ class VectorStore:
             if results['ids']:
                 self.clauses_collection.delete(ids=results['ids'])
                 logger.info(f"Cleared {len(results['ids'])} clauses for {framework}")
+            self.set_corpus_hash(None, framework)
         else:
             # Clear all
             self.client.delete_collection("esg_clauses")
@@ -346,6 +610,58 @@ class VectorStore:
             )
             logger.info("Cleared all clauses")
     
+    # ============= Corpus Hashing =============
+    
+    @staticmethod
+    def compute_corpus_hash(clauses: Iterable[ESGClause]) -> str:
+        """Order-independent hash of the clause fields that are embedded and indexed"""
+        return VectorStore.corpus_hash_from_entries(
+            VectorStore.corpus_hash_entry(c) for c in clauses
+        )
+    
+    @staticmethod
+    def corpus_hash_entry(clause: ESGClause) -> bytes:
+        """Hash input for one clause; lets streaming imports hash without keeping the clauses"""
+        return "\x1f".join([
+            str(CLAUSE_METADATA_VERSION),
+            clause.clause_id,
+            clause.title,
+            clause.description,
+            clause.section or "",
+            ",".join(_EVIDENCE_TYPE_VALUES[et] for et in clause.required_evidence_type),
+            ",".join(clause.keywords),
+            str(clause.mandatory),
+        ]).encode("utf-8")
+    
+    @staticmethod
+    def corpus_hash_from_entries(entries: Iterable[bytes]) -> str:
+        """Combine corpus_hash_entry() values (any order) into the corpus hash"""
+        hasher = CorpusHasher()
+        for entry in entries:
+            hasher.update(entry)
+        return hasher.hexdigest()
+    
+    def get_corpus_hash(self, framework: str) -> Optional[str]:
+        """Get the corpus hash stored for a framework's indexed clauses"""
+        metadata = self.clauses_collection.metadata or {}
+        return metadata.get(f"corpus_hash_{framework}")
+    
+    def set_corpus_hash(self, corpus_hash: Optional[str], framework: str):
+        """Store (or remove, when None) a framework's corpus hash in collection metadata"""
+        key = f"corpus_hash_{framework}"
+        metadata = {
+            k: v for k, v in (self.clauses_collection.metadata or {}).items()
+            if not k.startswith("hnsw:")
+        }
+        if corpus_hash is None:
+            if key not in metadata:
+                return
+            metadata.pop(key)
+        else:
+            metadata[key] = corpus_hash
+        metadata.setdefault("description", "ESG standard clauses")
+        self.clauses_collection.modify(metadata=metadata)
+    
     # ============= Utility Methods =============
     
     def get_collection_stats(self) -> Dict[str, Any]:
@@ -1,69 +1,288 @@
 """
 Import pre-parsed clauses from JSON file into the vector store
 Use this after parsing clauses on a separate machine with more memory
+
+If a .msgpack or .jsonl copy written by parse_tcfd_standalone.py sits next
+to the JSON file (and is not older than it), it is loaded instead. The
+.pkl.zst export is only read when passed explicitly (pickle is for trusted
+files only).
 """
 
+import io
+import re
 import sys
 import json
+import pickle
+from itertools import chain
 from pathlib import Path
+from typing import Any, Iterator, Optional, Tuple
+
+try:
+    import orjson  # Faster full-file parse when streaming is unavailable
+except ImportError:
+    orjson = None
+
+try:
+    import ijson  # Streams clauses one at a time; peak memory independent of file size
+except ImportError:
+    ijson = None
+
+try:
+    import zstandard  # Compressed pickle export (.pkl.zst)
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack  # Binary copy of the JSON written by parse_tcfd_standalone.py
+except ImportError:
+    msgpack = None
 
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.models import ESGClause, ESGFramework, EvidenceType, ValidationRule
-from app.vector_store import VectorStore
+from app.vector_store import CorpusHasher, VectorStore
 from app.config import settings
 
-def load_clauses_from_json(json_path: Path):
-    """Load clauses from JSON file and convert to ESGClause objects"""
-    print(f"Loading clauses from {json_path}...")
+# Start of a JSON export up to the framework value: {"framework":
+_FRAMEWORK_PREFIX_RE = re.compile(r'\s*\{\s*"framework"\s*:\s*')
+
+def clause_from_dict(clause_data: dict) -> ESGClause:
+    """Convert one clause entry of the JSON file to an ESGClause"""
+    # Convert evidence types
+    evidence_types = [
+        EvidenceType(et) for et in clause_data.get("required_evidence_type", [])
+    ]
+    
+    # Convert validation rules
+    validation_rules = []
+    for rule_data in clause_data.get("validation_rules", []):
+        validation_rules.append(ValidationRule(
+            rule_id=rule_data["rule_id"],
+            rule_type=rule_data["rule_type"],
+            description=rule_data["description"],
+            parameters=rule_data["parameters"],
+            mandatory=rule_data.get("mandatory", False)
+        ))
+    
+    # Create clause
+    return ESGClause(
+        clause_id=clause_data["clause_id"],
+        framework=ESGFramework(clause_data["framework"]),
+        section=clause_data.get("section"),
+        title=clause_data["title"],
+        description=clause_data["description"],
+        required_evidence_type=evidence_types,
+        mandatory=clause_data.get("mandatory", True),
+        validation_rules=validation_rules,
+        keywords=clause_data.get("keywords", [])
+    )
+
+def resolve_clause_file(json_path: Path) -> Path:
+    """
+    Prefer a sibling copy of a JSON clause file when it is usable
+    
+    Tries the .msgpack copy (fastest to load, needs msgpack) and then the
+    .jsonl copy (streams line by line without ijson). A copy older than the
+    JSON (e.g. the JSON was edited) is ignored, as is any copy when the
+    given file is not .json.
+    """
+    if json_path.suffix != '.json':
+        return json_path
+    candidates = [json_path.with_suffix('.jsonl')]
+    if msgpack is not None:
+        candidates.insert(0, json_path.with_suffix('.msgpack'))
+    json_mtime = json_path.stat().st_mtime
+    for candidate in candidates:
+        if candidate.exists() and candidate.stat().st_mtime >= json_mtime:
+            return candidate
+    return json_path
+
+def _is_msgpack(path: Path) -> bool:
+    """Whether a clause file is the msgpack copy rather than JSON"""
+    return path.suffix == '.msgpack'
+
+def _is_jsonl(path: Path) -> bool:
+    """Whether a clause file is JSONL (one clause per line, .meta.json sidecar)"""
+    return path.suffix == '.jsonl'
+
+def _is_pickle(path: Path) -> bool:
+    """Whether a clause file is the zstd-compressed pickle export"""
+    return path.name.endswith('.pkl.zst')
+
+def _iter_pickle(path: Path) -> Iterator:
+    """Header dict, then ESGClause objects, from a .pkl.zst export"""
+    if zstandard is None:
+        raise RuntimeError("zstandard is required to read .pkl.zst clause files")
+    with open(path, 'rb') as raw, zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+        # stream_reader may return short reads; pickle needs exact ones
+        f = io.BufferedReader(reader)
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+def _loads(data: bytes):
+    """Parse one JSON document (orjson when installed)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _iter_jsonl(f) -> Iterator[dict]:
+    """Clause dicts of an open JSONL file, one line at a time"""
+    for line in f:
+        if line.strip():
+            yield _loads(line)
+
+def _iter_msgpack(f, stop_key: str = "clauses") -> Iterator[Tuple[str, Any]]:
+    """
+    Stream a msgpack clause file: (key, value) for each top-level header
+    entry, then ("clause", clause_dict) for each item of "clauses"
+    
+    Only one clause is decoded at a time; stop iterating early to read
+    just the header ("framework" is written first).
+    """
+    unpacker = msgpack.Unpacker(f, raw=False)
+    for _ in range(unpacker.read_map_header()):
+        key = unpacker.unpack()
+        if key == stop_key:
+            for _ in range(unpacker.read_array_header()):
+                yield "clause", unpacker.unpack()
+        else:
+            yield key, unpacker.unpack()
+
+def _json_framework_prefix(json_path: Path) -> Optional[str]:
+    """
+    "framework" read from the start of a JSON export without parsing the rest
     
+    parse_tcfd_standalone.py writes {"framework": ..., ...} first; returns
+    None for any other layout so the caller can fall back to a full parse.
+    """
     with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        head = f.read(4096)
+    match = _FRAMEWORK_PREFIX_RE.match(head)
+    if match is None:
+        return None
+    try:
+        framework, _ = json.JSONDecoder().raw_decode(head, match.end())
+    except ValueError:
+        return None
+    return framework if isinstance(framework, str) else None
+
+def _load_json(json_path: Path) -> dict:
+    """Parse a whole JSON file (orjson when installed)"""
+    with open(json_path, 'rb') as f:
+        return _loads(f.read())
+
+def read_framework(json_path: Path) -> str:
+    """Read the top-level framework name without parsing the clause list"""
+    if _is_pickle(json_path):
+        for header in _iter_pickle(json_path):
+            return header.get("framework", "UNKNOWN")
+        return "UNKNOWN"
+    if _is_jsonl(json_path):
+        meta_path = json_path.with_suffix('.meta.json')
+        if meta_path.exists():
+            return _load_json(meta_path).get("framework", "UNKNOWN")
+        with open(json_path, 'rb') as f:
+            # No sidecar: every line carries its clause's framework
+            for clause_data in _iter_jsonl(f):
+                return clause_data.get("framework", "UNKNOWN")
+        return "UNKNOWN"
+    if _is_msgpack(json_path):
+        with open(json_path, 'rb') as f:
+            for key, value in _iter_msgpack(f):
+                if key == "framework":
+                    return value
+        return "UNKNOWN"
+    if ijson is not None:
+        with open(json_path, 'rb') as f:
+            # "framework" is written before "clauses", so this stops early
+            for framework in ijson.items(f, 'framework'):
+                return framework
+        return "UNKNOWN"
+    framework = _json_framework_prefix(json_path)
+    if framework is not None:
+        return framework
+    return _load_json(json_path).get("framework", "UNKNOWN")
+
+def iter_clauses_from_json(json_path: Path) -> Iterator[ESGClause]:
+    """
+    Yield ESGClause objects from the JSON file one at a time
     
-    framework_str = data.get("framework", "UNKNOWN")
-    clauses_data = data.get("clauses", [])
+    JSONL and msgpack files are always streamed, and JSON files are
+    streamed when ijson is installed, so only the clause being converted
+    is held in memory; otherwise the file is parsed in one go.
+    """
+    print(f"Loading clauses from {json_path}...")
     
-    print(f"Framework: {framework_str}")
-    print(f"Total clauses in file: {len(clauses_data)}")
-    print()
+    if _is_pickle(json_path):
+        records = _iter_pickle(json_path)
+        next(records, None)  # header
+        try:
+            yield from records
+        finally:
+            records.close()
+        return
+    
+    if _is_jsonl(json_path):
+        f = open(json_path, 'rb')
+        clauses_data = _iter_jsonl(f)
+    elif _is_msgpack(json_path):
+        f = open(json_path, 'rb')
+        clauses_data = (value for key, value in _iter_msgpack(f) if key == "clause")
+    elif ijson is not None:
+        f = open(json_path, 'rb')
+        clauses_data = ijson.items(f, 'clauses.item', use_float=True)
+    else:
+        f = None
+        clauses_data = _load_json(json_path).get("clauses", [])
+    
+    try:
+        for clause_data in clauses_data:
+            try:
+                yield clause_from_dict(clause_data)
+            except Exception as e:
+                print(f"Warning: Failed to convert clause {clause_data.get('clause_id', '?')}: {e}")
+    finally:
+        if f is not None:
+            f.close()
+
+def _is_delta(path: Path) -> bool:
+    """Whether a clause file is an incremental export (<name>.delta.json)"""
+    return path.name.endswith('.delta.json')
+
+def apply_delta(delta_path: Path, vector_store: VectorStore) -> Tuple[str, int, int]:
+    """
+    Apply an incremental export written by parse_tcfd_standalone.py
+    
+    Deletes every entry of the changed and deleted clause ids, then adds the
+    delta's clauses. Deltas build on the previous run's export, so they must
+    be applied in order on top of it (import the full file when unsure).
+    The corpus hash is cleared since it no longer matches a full export.
+    
+    Returns:
+        (framework, clauses added, clause ids deleted)
+    """
+    data = _load_json(delta_path)
+    framework = data.get("framework", "UNKNOWN")
+    deleted_ids = data.get("deleted_ids", [])
+    vector_store.delete_clauses(chain(data.get("changed_ids", []), deleted_ids), framework)
     
     clauses = []
-    for clause_data in clauses_data:
+    for clause_data in data.get("clauses", []):
         try:
-            # Convert evidence types
-            evidence_types = [
-                EvidenceType(et) for et in clause_data.get("required_evidence_type", [])
-            ]
-            
-            # Convert validation rules
-            validation_rules = []
-            for rule_data in clause_data.get("validation_rules", []):
-                validation_rules.append(ValidationRule(
-                    rule_id=rule_data["rule_id"],
-                    rule_type=rule_data["rule_type"],
-                    description=rule_data["description"],
-                    parameters=rule_data["parameters"],
-                    mandatory=rule_data.get("mandatory", False)
-                ))
-            
-            # Create clause
-            clause = ESGClause(
-                clause_id=clause_data["clause_id"],
-                framework=ESGFramework(clause_data["framework"]),
-                section=clause_data.get("section"),
-                title=clause_data["title"],
-                description=clause_data["description"],
-                required_evidence_type=evidence_types,
-                mandatory=clause_data.get("mandatory", True),
-                validation_rules=validation_rules,
-                keywords=clause_data.get("keywords", [])
-            )
-            clauses.append(clause)
-            
+            clauses.append(clause_from_dict(clause_data))
         except Exception as e:
             print(f"Warning: Failed to convert clause {clause_data.get('clause_id', '?')}: {e}")
-    
+    added = vector_store.add_clauses(clauses) if clauses else 0
+    return framework, added, len(deleted_ids)
+
+def load_clauses_from_json(json_path: Path):
+    """Load clauses from JSON file and convert to ESGClause objects"""
+    framework_str = read_framework(json_path)
+    clauses = list(iter_clauses_from_json(json_path))
     print(f"✓ Converted {len(clauses)} clauses")
     return clauses, framework_str
 
@@ -77,16 +296,39 @@ def main():
     if not json_file.exists():
         print(f"Error: File not found: {json_file}")
         sys.exit(1)
+    json_file = resolve_clause_file(json_file)
+    
+    if _is_delta(json_file):
+        print("=" * 80)
+        print("ESGBuddy Clause Importer (incremental)")
+        print("=" * 80)
+        print()
+        print("Initializing vector store...")
+        framework, added, deleted = apply_delta(json_file, VectorStore())
+        print()
+        print("=" * 80)
+        print("SUCCESS!")
+        print("=" * 80)
+        print(f"Applied {framework} delta: {added} clauses added/updated, {deleted} clause ids removed")
+        print()
+        print("Restart the backend to load these clauses into memory for the API.")
+        print()
+        return
     
     print("=" * 80)
     print("ESGBuddy Clause Importer")
     print("=" * 80)
     print()
     
-    # Load clauses from JSON
-    clauses, framework = load_clauses_from_json(json_file)
+    # Stream clauses from JSON
+    framework = read_framework(json_file)
+    print(f"Framework: {framework}")
+    print()
+    clauses = iter_clauses_from_json(json_file)
     
-    if not clauses:
+    # Check there is something to import before clearing the framework
+    first = next(clauses, None)
+    if first is None:
         print("No clauses to import")
         sys.exit(0)
     
@@ -98,15 +340,23 @@ def main():
     print(f"Clearing existing {framework} clauses from vector store...")
     vector_store.clear_clauses(framework)
     
-    # Add new clauses
-    print(f"Adding {len(clauses)} clauses to vector store...")
-    vector_store.add_clauses(clauses)
+    # Add new clauses, hashing each one as it passes through
+    print("Adding clauses to vector store...")
+    hasher = CorpusHasher()
+    
+    def hashed(stream: Iterator[ESGClause]) -> Iterator[ESGClause]:
+        for clause in stream:
+            hasher.update(VectorStore.corpus_hash_entry(clause))
+            yield clause
+    
+    total = vector_store.add_clauses(hashed(chain([first], clauses)))
+    vector_store.set_corpus_hash(hasher.hexdigest(), framework)
     
     print()
     print("=" * 80)
     print("SUCCESS!")
     print("=" * 80)
-    print(f"Imported {len(clauses)} {framework} clauses into vector store")
+    print(f"Imported {total} {framework} clauses into vector store")
     print()
     print("Restart the backend to load these clauses into memory for the API.")
     print()
@@ -4,30 +4,480 @@ Run this on a machine with sufficient memory to parse TCFD documents
 Exports clauses to JSON for import on the main system
 """
 
+import io
+import os
 import sys
 import json
+import hashlib
+import pickle
+import argparse
+import cProfile
+import pstats
+import tempfile
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson  # C serializer straight to bytes; json fallback below
+except ImportError:
+    orjson = None
+
+try:
+    from tqdm import tqdm  # Progress bars on stderr (throttled, quiet when redirected)
+except ImportError:
+    tqdm = None
+
+try:
+    import zstandard  # Compressed pickle export (.pkl.zst)
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack  # Compact binary copy for transfer; JSON stays for inspection
+except ImportError:
+    msgpack = None
 
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.clause_parser_enhanced import EnhancedClauseParser
-from app.models import ESGFramework
+from app.models import ESGClause, ESGFramework
+
+# Output files are written in many small pieces; buffer them into few large writes
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# mkstemp creates 0600 files; atomic writes get the mode open() would have used
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_UMASK
+
+def _iter_json_array(clauses: Iterable[ESGClause]) -> Iterator[bytes]:
+    """Pieces of a compact JSON array of clauses, produced one clause at a time"""
+    yield b'['
+    for i, clause in enumerate(clauses):
+        if i:
+            yield b','
+        yield _clause_json(clause)
+    yield b']'
+
+def _progress(iterable, desc: str, unit: str, total: Optional[int] = None):
+    """Wrap an iterable in a tqdm progress bar when tqdm is installed"""
+    if tqdm is None:
+        return iterable
+    return tqdm(iterable, desc=desc, unit=unit, total=total, file=sys.stderr)
+
+def _log(message: str):
+    """Print without breaking an active progress bar"""
+    if tqdm is None:
+        print(message)
+    else:
+        tqdm.write(message)
+
+def _encode_default(obj: Any) -> Any:
+    """
+    default= hook for json/msgpack encoders: clause -> plain data
+    
+    Lets the clause list itself be handed to the encoder, so each clause is
+    converted only when the encoder reaches it (no list of dicts up front).
+    Same format import_clauses.py reads.
+    """
+    if isinstance(obj, ESGClause):
+        return obj.model_dump(mode='json')
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+def _clause_json(clause: ESGClause) -> bytes:
+    """Compact UTF-8 JSON of a clause, serialized by pydantic-core without an intermediate dict"""
+    return ESGClause.__pydantic_serializer__.to_json(clause)
+
+def _dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _json_header(framework: str, total: int) -> bytes:
+    """Opening of the compact JSON export, up to the clause array"""
+    return b'{"framework":%s,"total_clauses":%d,"clauses":' % (_dumps(framework), total)
+
+def _write_jsonl_meta(jsonl_file: Path, framework: str, total: int):
+    """Write the <name>.meta.json sidecar of a JSONL export"""
+    with open(jsonl_file.with_suffix('.meta.json'), 'wb') as f:
+        f.write(_dumps({"framework": framework, "total_clauses": total}))
+
+def write_clauses_json(
+    clauses: List[ESGClause],
+    output_file: Path,
+    framework: str = "TCFD",
+    pretty: bool = False
+) -> int:
+    """
+    Stream clauses to a JSON file one clause at a time
+    
+    Writes {"framework": ..., "total_clauses": N, "clauses": [...]} without
+    building the whole document in memory first. pretty=True writes the
+    indented (larger, slower) form for debugging instead.
+    
+    Returns:
+        Number of clauses written
+    """
+    if pretty:
+        with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as raw, \
+                io.TextIOWrapper(raw, encoding='utf-8', write_through=False) as f:
+            json.dump({
+                "framework": framework,
+                "total_clauses": len(clauses),
+                "clauses": clauses
+            }, f, indent=2, ensure_ascii=False, default=_encode_default)
+        return len(clauses)
+    
+    with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(_json_header(framework, len(clauses)))
+        f.writelines(_iter_json_array(_progress(clauses, "serialize", "clause")))
+        f.write(b'}')
+    return len(clauses)
+
+def write_compact_exports(
+    clauses: List[ESGClause],
+    json_file: Optional[Path],
+    jsonl_file: Path,
+    framework: str = "TCFD"
+) -> Dict[str, str]:
+    """
+    Write the compact JSON and JSONL exports and hash the manifest in one pass
+    
+    Each clause is encoded once and its bytes go straight to both files
+    and the manifest hash, then are dropped, so memory stays at one clause.
+    Same bytes as write_clauses_json / clause_manifest. json_file=None skips
+    the compact JSON (e.g. when --pretty writes it separately).
+    
+    The JSONL export has one compact clause per line plus a <name>.meta.json
+    sidecar with {"framework": ..., "total_clauses": N}, so importers know the
+    framework and count and can stream the lines without a streaming JSON parser.
+    
+    Returns:
+        The clause manifest (see clause_manifest)
+    """
+    hashes: Dict[str, Any] = {}
+    with ExitStack() as stack:
+        jsonl_out = stack.enter_context(open(jsonl_file, 'wb', buffering=OUTPUT_BUFFER_SIZE))
+        json_out = None
+        if json_file is not None:
+            json_out = stack.enter_context(open(json_file, 'wb', buffering=OUTPUT_BUFFER_SIZE))
+            json_out.write(_json_header(framework, len(clauses)) + b'[')
+        for i, clause in enumerate(_progress(clauses, "serialize", "clause")):
+            clause_bytes = _clause_json(clause)
+            if json_out is not None:
+                if i:
+                    json_out.write(b',')
+                json_out.write(clause_bytes)
+            jsonl_out.write(clause_bytes)
+            jsonl_out.write(b'\n')
+            _update_manifest_hash(hashes, clause.clause_id, clause_bytes)
+        if json_out is not None:
+            json_out.write(b']}')
+    _write_jsonl_meta(jsonl_file, framework, len(clauses))
+    return {clause_id: h.hexdigest() for clause_id, h in hashes.items()}
+
+def write_clauses_msgpack(
+    clauses: List[ESGClause],
+    output_file: Path,
+    framework: str = "TCFD"
+) -> int:
+    """
+    Write the same document as write_clauses_json in msgpack form
+    
+    Smaller and several times faster to load than JSON; import_clauses.py
+    picks it up when it sits next to the JSON file. Streamed one clause at
+    a time like the compact JSON writer.
+    
+    Returns:
+        Number of clauses written
+    """
+    packer = msgpack.Packer(use_bin_type=True, default=_encode_default)
+    with open(output_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(packer.pack_map_header(3))
+        f.write(packer.pack("framework"))
+        f.write(packer.pack(framework))
+        f.write(packer.pack("total_clauses"))
+        f.write(packer.pack(len(clauses)))
+        f.write(packer.pack("clauses"))
+        f.write(packer.pack_array_header(len(clauses)))
+        for clause in clauses:
+            f.write(packer.pack(clause))
+    return len(clauses)
+
+def write_clauses_pickle(
+    clauses: List[ESGClause],
+    output_file: Path,
+    framework: str = "TCFD"
+) -> int:
+    """
+    Write clauses as a zstd-compressed pickle stream (.pkl.zst)
+    
+    The stream is a {"framework", "total_clauses"} header followed by one
+    pickled ESGClause per record, so readers can stop after the header or
+    load clauses one at a time. Fastest format for a trusted Python
+    importer; never load it from an untrusted source.
+    
+    Returns:
+        Number of clauses written
+    """
+    with open(output_file, 'wb') as raw, \
+            zstandard.ZstdCompressor(level=3).stream_writer(raw) as f:
+        pickle.dump({"framework": framework, "total_clauses": len(clauses)}, f, protocol=5)
+        for clause in clauses:
+            pickle.dump(clause, f, protocol=5)
+    return len(clauses)
+
+def clause_manifest(clauses: List[ESGClause]) -> Dict[str, str]:
+    """
+    clause_id -> hash of its serialized clause(s)
+    
+    Clause ids are not unique in every standard, so clauses sharing an id
+    are hashed together (in order) and change/delete as one unit.
+    """
+    hashes: Dict[str, Any] = {}
+    for clause in clauses:
+        _update_manifest_hash(hashes, clause.clause_id, _clause_json(clause))
+    return {clause_id: h.hexdigest() for clause_id, h in hashes.items()}
+
+def _update_manifest_hash(hashes: Dict[str, Any], clause_id: str, clause_bytes: bytes):
+    """Feed one serialized clause into its clause_id's running manifest hash"""
+    h = hashes.get(clause_id)
+    if h is None:
+        h = hashes[clause_id] = hashlib.blake2b(digest_size=16)
+    h.update(clause_bytes)
+    h.update(b'\n')
+
+def write_clauses_delta(
+    clauses: List[ESGClause],
+    delta_file: Path,
+    manifest_file: Path,
+    framework: str = "TCFD",
+    manifest: Optional[Dict[str, str]] = None
+) -> Tuple[int, int]:
+    """
+    Write only what changed since the previous run, then update the manifest
+    
+    Compares clause hashes against manifest_file (from the previous run)
+    and writes {"framework", "changed_ids", "deleted_ids", "total_clauses",
+    "clauses"} where "clauses" holds every clause of a changed/new id.
+    With no previous manifest the delta is the full clause set. The new
+    manifest is written atomically after the delta. Pass manifest (e.g.
+    from write_compact_exports) to skip hashing the clauses again; only
+    clauses of changed ids are then serialized.
+    
+    Returns:
+        (number of changed clause ids, number of deleted clause ids)
+    """
+    if manifest is None:
+        manifest = clause_manifest(clauses)
+    previous: Dict[str, str] = {}
+    if manifest_file.exists():
+        try:
+            with open(manifest_file, 'rb') as f:
+                previous = json.loads(f.read()).get("clauses", {})
+        except Exception as e:
+            print(f"  Ignoring unreadable manifest {manifest_file.name}: {e}")
+    
+    changed = {cid for cid, digest in manifest.items() if previous.get(cid) != digest}
+    deleted = sorted(cid for cid in previous if cid not in manifest)
+    changed_ids = sorted(changed)
+    n_changed = sum(1 for c in clauses if c.clause_id in changed)
+    
+    with open(delta_file, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+        f.write(b'{"framework":%s,"changed_ids":%s,"deleted_ids":%s,"total_clauses":%d,"clauses":' % (
+            _dumps(framework), _dumps(changed_ids), _dumps(deleted), n_changed
+        ))
+        f.writelines(_iter_json_array(c for c in clauses if c.clause_id in changed))
+        f.write(b'}')
+    _atomic_write(manifest_file, [_dumps({"framework": framework, "clauses": manifest})])
+    return len(changed_ids), len(deleted)
+
+# Parser of each worker process (LLM clients are created per process, never pickled)
+_worker_parser = None
+
+def _init_worker(standards_dir: str, use_llm: bool):
+    """ProcessPoolExecutor initializer: one parser per worker process"""
+    global _worker_parser
+    _worker_parser = EnhancedClauseParser(use_llm=use_llm)
+    _worker_parser.standards_dir = Path(standards_dir)
+
+def _parse_one_pdf(pdf_path: Path, framework: ESGFramework) -> Tuple[List[ESGClause], Optional[str]]:
+    """Parse one standard PDF in a worker process; returns the clauses and their parse mode"""
+    return _worker_parser._parse_standard_document_with_mode(pdf_path, framework)
+
+def _pdf_cache_key(pdf_path: Path, parser: EnhancedClauseParser) -> str:
+    """Cache key: PDF content + parser version + parsing mode (LLM model or regex)"""
+    h = hashlib.sha256()
+    h.update(f"v{EnhancedClauseParser.PARSER_VERSION}|{parser.parse_mode()}|".encode('utf-8'))
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(OUTPUT_BUFFER_SIZE), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _load_cached_clauses(cache_dir: Path, key: str) -> Optional[List[ESGClause]]:
+    """Clauses cached for a PDF, or None on a miss/unreadable entry"""
+    cache_file = cache_dir / f"{key}.json"
+    if not cache_file.exists():
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            return [ESGClause.model_validate(d) for d in json.loads(f.read())]
+    except Exception as e:
+        print(f"  Ignoring unreadable cache entry {cache_file.name}: {e}")
+        return None
+
+def _atomic_write(path: Path, chunks: Iterable[bytes]):
+    """Write byte chunks to a file atomically (temp file in the same directory + os.replace)"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+            f.writelines(chunks)
+        os.chmod(tmp_path, DEFAULT_FILE_MODE)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _store_cached_clauses(cache_dir: Path, key: str, clauses: List[ESGClause]):
+    """Write a PDF's clauses to the cache atomically"""
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _atomic_write(cache_dir / f"{key}.json", _iter_json_array(clauses))
+
+def parse_framework_parallel(
+    parser: EnhancedClauseParser,
+    framework: ESGFramework,
+    n_workers: int,
+    cache_dir: Optional[Path] = None
+) -> List[ESGClause]:
+    """
+    Parse a framework's PDFs in parallel worker processes
+    
+    Same result as parser.parse_framework (clauses in PDF order); a PDF that
+    fails is logged and skipped, as in the serial parser. With cache_dir set,
+    PDFs whose content was already parsed (same parser version and mode)
+    are loaded from the cache instead of being parsed again. Only complete
+    parses are cached: degraded output (skipped LLM chunks, regex fallback,
+    no clauses) is parsed again on the next run.
+    """
+    pdf_files = parser.list_framework_pdfs(framework)
+    results = {}
+    cache_keys = {}
+    pending = []
+    for pdf_path in pdf_files:
+        if cache_dir is not None:
+            cache_keys[pdf_path] = _pdf_cache_key(pdf_path, parser)
+            cached = _load_cached_clauses(cache_dir, cache_keys[pdf_path])
+            if cached is not None:
+                results[pdf_path] = cached
+                print(f"  Loaded {len(cached)} cached clauses for {pdf_path.name}")
+                continue
+        pending.append(pdf_path)
+    
+    mode = parser.parse_mode()
+    
+    def record(pdf_path: Path, parsed: Tuple[List[ESGClause], Optional[str]]):
+        clauses, parsed_mode = parsed
+        results[pdf_path] = clauses
+        _log(f"  Parsed {len(clauses)} clauses from {pdf_path.name}")
+        if cache_dir is None:
+            return
+        if parsed_mode == mode:
+            _store_cached_clauses(cache_dir, cache_keys[pdf_path], clauses)
+        else:
+            _log(f"  Not caching incomplete parse of {pdf_path.name}")
+    
+    n_workers = min(n_workers, len(pending))
+    if n_workers <= 1:
+        for pdf_path in _progress(pending, "parse", "pdf"):
+            try:
+                record(pdf_path, parser._parse_standard_document_with_mode(pdf_path, framework))
+            except Exception as e:
+                _log(f"  ✗ Error parsing {pdf_path.name}: {e}")
+    else:
+        print(f"Parsing {len(pending)} PDFs with {n_workers} worker processes...")
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            initializer=_init_worker,
+            initargs=(str(parser.standards_dir), parser.use_llm)
+        ) as pool:
+            futures = {pool.submit(_parse_one_pdf, pdf_path, framework): pdf_path for pdf_path in pending}
+            for future in _progress(as_completed(futures), "parse", "pdf", total=len(futures)):
+                pdf_path = futures[future]
+                try:
+                    record(pdf_path, future.result())
+                except Exception as e:
+                    _log(f"  ✗ Error parsing {pdf_path.name}: {e}")
+    
+    return [clause for pdf_path in pdf_files for clause in results.get(pdf_path, [])]
+
+def prepare_process(niceness: int) -> int:
+    """
+    Be a polite tenant on a shared HPC node; returns the usable CPU count
+    
+    Lowers this process's priority by `niceness` (inherited by the parse
+    workers) and widens CPU affinity to every CPU the node/cgroup allows,
+    undoing a narrower mask inherited from the batch scheduler. Both are
+    best effort: unsupported platforms and denied calls are skipped.
+    """
+    if niceness:
+        try:
+            os.nice(niceness)
+        except (AttributeError, OSError) as e:
+            print(f"Could not lower priority: {e}")
+    try:
+        os.sched_setaffinity(0, range(os.cpu_count() or 1))
+    except (AttributeError, OSError) as e:
+        print(f"Could not reset CPU affinity: {e}")
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
 
 def main():
+    arg_parser = argparse.ArgumentParser(description="Parse TCFD standards and export clauses to JSON")
+    arg_parser.add_argument("--pretty", action="store_true",
+                            help="write indented JSON (debugging; larger and slower)")
+    arg_parser.add_argument("--workers", type=int, default=None,
+                            help="PDFs parsed in parallel (default: CPU count, max 8 to respect LLM rate limits)")
+    arg_parser.add_argument("--cache-dir", type=Path, default=Path(".tcfd_cache"),
+                            help="per-PDF parse cache, keyed by PDF content (default: .tcfd_cache)")
+    arg_parser.add_argument("--no-cache", action="store_true",
+                            help="parse every PDF again, ignoring and not updating the cache")
+    arg_parser.add_argument("--profile", type=Path, metavar="PSTATS",
+                            help="profile parsing with cProfile, save stats here and print the top 20 "
+                                 "functions by self time (use --workers 1 to include the parse itself)")
+    arg_parser.add_argument("--nice", type=int, default=10,
+                            help="lower process priority by this much on shared nodes (default: 10, 0 to keep)")
+    args = arg_parser.parse_args()
+    
+    n_cpus = prepare_process(args.nice)
+    if args.workers is None:
+        args.workers = min(n_cpus, 8)
+    
     print("=" * 80)
     print("TCFD Standalone Parser for HPC Node")
     print("=" * 80)
     print()
     
-    # Configuration
-    standards_dir = Path("../Standards")  # Adjust if needed
-    output_file = Path("tcfd_clauses.json")
+    # Configuration (resolved once; workers and PDF listing reuse the absolute paths)
+    standards_dir = Path("../Standards").resolve()  # Adjust if needed
+    output_file = Path("tcfd_clauses.json").resolve()
+    tcfd_dir = standards_dir / ESGFramework.TCFD.value
     
-    print(f"Standards directory: {standards_dir.resolve()}")
-    print(f"Output file: {output_file.resolve()}")
+    print(f"Standards directory: {standards_dir}")
+    print(f"Output file: {output_file}")
     print()
     
+    # Fail before creating clients/workers rather than finding nothing to parse
+    if not tcfd_dir.is_dir():
+        print(f"✗ TCFD standards directory not found: {tcfd_dir}")
+        print("Copy the Standards/ directory next to backend/ (see HPC_SETUP.md)")
+        sys.exit(1)
+    
     # Initialize parser with LLM enabled
     print("Initializing parser with LLM enabled...")
     parser = EnhancedClauseParser(use_llm=True)
@@ -35,49 +485,57 @@ def main():
     
     # Parse TCFD
     print("Parsing TCFD documents...")
-    print(f"TCFD directory: {standards_dir / 'TCFD'}")
+    print(f"TCFD directory: {tcfd_dir}")
     print()
     
+    cache_dir = None if args.no_cache else args.cache_dir
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
     try:
-        tcfd_clauses = parser.parse_framework(ESGFramework.TCFD)
-        print(f"\n✓ Successfully parsed {len(tcfd_clauses)} TCFD clauses")
-        print()
-        
-        # Convert to JSON-serializable format
-        print("Converting clauses to JSON format...")
-        clauses_json = []
-        for clause in tcfd_clauses:
-            clauses_json.append({
-                "clause_id": clause.clause_id,
-                "framework": clause.framework.value,
-                "section": clause.section,
-                "title": clause.title,
-                "description": clause.description,
-                "required_evidence_type": [et.value for et in clause.required_evidence_type],
-                "mandatory": clause.mandatory,
-                "validation_rules": [
-                    {
-                        "rule_id": rule.rule_id,
-                        "rule_type": rule.rule_type,
-                        "description": rule.description,
-                        "parameters": rule.parameters,
-                        "mandatory": rule.mandatory
-                    }
-                    for rule in clause.validation_rules
-                ],
-                "keywords": clause.keywords
-            })
-        
-        # Save to JSON
+        tcfd_clauses = parse_framework_parallel(parser, ESGFramework.TCFD, args.workers, cache_dir=cache_dir)
+    except KeyboardInterrupt:
+        # Finished PDFs were already written to the cache as they completed
+        print("\n✗ Interrupted while parsing")
+        if cache_dir is not None:
+            print(f"PDFs finished so far are cached in {cache_dir}; re-run to continue from there")
+        sys.exit(130)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"\nProfile saved to {args.profile}")
+            pstats.Stats(profiler).sort_stats("tottime").print_stats(20)
+    print(f"\n✓ Successfully parsed {len(tcfd_clauses)} TCFD clauses")
+    print()
+    
+    try:
+        # Save to JSON (streamed clause by clause)
         print(f"Saving to {output_file}...")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "framework": "TCFD",
-                "total_clauses": len(clauses_json),
-                "clauses": clauses_json
-            }, f, indent=2, ensure_ascii=False)
+        jsonl_file = output_file.with_suffix('.jsonl')
+        if args.pretty:
+            write_clauses_json(tcfd_clauses, output_file, pretty=True)
+        # One pass: compact JSON (unless --pretty), JSONL and the delta manifest hashes
+        manifest = write_compact_exports(
+            tcfd_clauses, None if args.pretty else output_file, jsonl_file
+        )
+        written = len(tcfd_clauses)
         
-        print(f"\n✓ Saved {len(clauses_json)} clauses to {output_file}")
+        print(f"\n✓ Saved {written} clauses to {output_file}")
+        print(f"✓ Saved {written} clauses to {jsonl_file} (one clause per line, meta in {jsonl_file.with_suffix('.meta.json')})")
+        if zstandard is not None:
+            pickle_file = output_file.with_suffix('.pkl.zst')
+            write_clauses_pickle(tcfd_clauses, pickle_file)
+            print(f"✓ Saved {written} clauses to {pickle_file} (trusted fast path: import_clauses.py {pickle_file})")
+        if msgpack is not None:
+            msgpack_file = output_file.with_suffix('.msgpack')
+            write_clauses_msgpack(tcfd_clauses, msgpack_file)
+            print(f"✓ Saved {written} clauses to {msgpack_file} (faster to import; transfer it alongside the JSON)")
+        delta_file = output_file.with_suffix('.delta.json')
+        changed, deleted = write_clauses_delta(
+            tcfd_clauses, delta_file, output_file.with_suffix('.manifest.json'), manifest=manifest
+        )
+        print(f"✓ Saved delta to {delta_file}: {changed} changed, {deleted} deleted clause ids since last run")
         print()
         print("=" * 80)
         print("SUCCESS!")
@@ -87,13 +545,15 @@ def main():
         print(f"1. Transfer '{output_file}' to your laptop")
         print("2. Place it in the backend/ directory")
         print("3. Run: python import_clauses.py tcfd_clauses.json")
+        print("   (or, if the laptop has the previous run imported: python import_clauses.py tcfd_clauses.delta.json)")
         print("   Or use the API: POST /system/import-clauses")
         print()
         
-    except Exception as e:
-        print(f"\n✗ Error parsing TCFD: {e}")
-        import traceback
-        traceback.print_exc()
+    except OSError as e:
+        # Parsed clauses are cached, so only the export needs redoing
+        print(f"\n✗ Error writing clause files: {e}")
+        if cache_dir is not None:
+            print(f"Parsed PDFs are cached in {cache_dir}; re-run after fixing the problem to skip re-parsing")
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""
+Vector store tests (need chromadb; skipped when it is not installed)
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+pytest.importorskip("chromadb")
+
+from app.config import settings
+from app.vector_store import VectorStore
+
+
+@pytest.fixture
+def persist_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "chroma_persist_directory", str(tmp_path / "chroma_db"))
+    return tmp_path
+
+
+def test_corpus_hash_survives_new_vector_store(persist_directory):
+    first = VectorStore()
+    first.set_corpus_hash("abc123", "TCFD")
+
+    second = VectorStore()
+
+    assert second.get_corpus_hash("TCFD") == "abc123"
+    assert second.clauses_collection.metadata["description"] == "ESG standard clauses"